@@ -0,0 +1,272 @@
+import os
+import time
+import asyncio
+import logging
+
+import aio_pika
+import httpx
+from pamqp.commands import Basic
+
+from consumer import (
+    RABBITMQ_URL,
+    QUEUE_NAME,
+    MAX_RETRIES,
+    RETRY_DELAY,
+    build_connection_parameters,
+    log_order
+)
+from utils.orders_client import ORDERS_SERVICE_URL, ORDERS_API_TIMEOUT, AsyncConfirmationBatcher
+from utils.retry import failure_route, retry_topology, dead_letter_queue_name
+from utils.dedup import get_dedup_store
+from utils.codec import decode_event, EventDecodeError
+from utils.metrics import LAST_MESSAGE, observe_handler, record_message, start_metrics_server
+from utils.queue_probe import QueueProbe
+from utils.logging_setup import log_sampled
+
+logger = logging.getLogger(__name__)
+
+# ✨ CONSUMER ASYNCIO: cada mensaje es una task; el prefetch limita cuántas
+# notificaciones quedan en vuelo esperando I/O a la vez
+ASYNC_CONSUMER_PREFETCH = max(1, int(os.getenv("ASYNC_CONSUMER_PREFETCH", "200")))
+SHUTDOWN_GRACE_PERIOD = float(os.getenv("SHUTDOWN_GRACE_PERIOD", "10"))
+
+message_counter = 0
+
+
+async def connect_to_rabbitmq():
+    """🚀 Conectar a RabbitMQ (aio-pika) con los mismos reintentos que el consumer síncrono"""
+    retries = 0
+    is_railway = "railway.internal" in RABBITMQ_URL or "rlwy.net" in RABBITMQ_URL
+
+    while retries < MAX_RETRIES:
+        try:
+            logger.info(f"Conectando a RabbitMQ... (intento {retries + 1}/{MAX_RETRIES})")
+
+            # amqps:// activa SSL automáticamente en aio-pika
+            connection = await aio_pika.connect(
+                RABBITMQ_URL,
+                timeout=15 if is_railway else 10,
+                heartbeat=30 if is_railway else 60
+            )
+            # on_return_raises: una copia no enrutable (cola .retry.N o DLQ
+            # borrada) lanza en lugar de resolverse como confirmada
+            channel = await connection.channel(publisher_confirms=True, on_return_raises=True)
+            await channel.set_qos(prefetch_count=ASYNC_CONSUMER_PREFETCH)
+
+            queue = await channel.declare_queue(
+                QUEUE_NAME,
+                durable=True,
+                exclusive=False,
+                auto_delete=False
+            )
+
+            # Colas de espera por intento y DLQ para mensajes fallidos
+            for name, arguments in retry_topology(QUEUE_NAME):
+                await channel.declare_queue(name, durable=True, arguments=arguments)
+
+            logger.info(f"Conectado a RabbitMQ - Cola: {QUEUE_NAME}")
+            return connection, queue
+
+        except Exception as e:
+            retries += 1
+            logger.error(f"Error conectando a RabbitMQ: {e}")
+
+            if retries < MAX_RETRIES:
+                logger.info(f"Reintentando en {RETRY_DELAY} segundos...")
+                await asyncio.sleep(RETRY_DELAY)
+            else:
+                logger.error("Maximo de reintentos alcanzado")
+                raise
+
+
+async def confirm_notification(confirmer: AsyncConfirmationBatcher, order_id: str):
+    """
+    Marcar el pedido como 'notified' en el orders service.
+
+    La confirmación se agrupa con las de otros mensajes en vuelo; un pedido
+    que ya avanzó de estado (re-entrega) o inexistente cuenta como definitivo.
+    """
+    outcome = await confirmer.confirm(order_id)
+    if outcome == "updated" and log_sampled(order_id):
+        logger.info(f"✅ NOTIFICACIÓN CONFIRMADA - Pedido {order_id} actualizado a 'notified'")
+
+
+async def dedup_call(method, message_id: str):
+    """Ejecutar `seen`/`mark` del dedup; con SQLite (DEDUP_DB_PATH) en un hilo para no bloquear el loop"""
+    if method.__self__.persistent:
+        return await asyncio.to_thread(method, message_id)
+    return method(message_id)
+
+
+async def handle_message(
+    message: aio_pika.abc.AbstractIncomingMessage,
+    confirmer: AsyncConfirmationBatcher,
+    exchange: aio_pika.abc.AbstractExchange
+):
+    """Procesar un mensaje sin bloquear el loop y confirmarlo"""
+    global message_counter
+    message_counter += 1
+    number = message_counter
+    started = time.perf_counter()
+    LAST_MESSAGE.set_to_current_time()
+
+    dedup = get_dedup_store()
+    if message.message_id and dedup is not None and await dedup_call(dedup.seen, message.message_id):
+        logger.info(f"Mensaje duplicado {message.message_id} - se confirma sin procesar")
+        await message.ack()
+        record_message("duplicate", started)
+        return
+
+    try:
+        payload = decode_event(message.body, message.content_type, message.content_encoding)
+        order_id = log_order(payload)
+
+        # Simular procesamiento (no bloquea al resto de mensajes)
+        await asyncio.sleep(1)
+        await confirm_notification(confirmer, order_id)
+
+        verbose = log_sampled(order_id)
+        if verbose:
+            logger.info(f"Notificacion procesada - Pedido {order_id}")
+        if message.message_id and dedup is not None:
+            await dedup_call(dedup.mark, message.message_id)
+        await message.ack()
+        record_message("processed", started)
+        if verbose:
+            logger.info(f"Mensaje #{number} procesado correctamente")
+
+    except EventDecodeError as e:
+        logger.error(f"Error decodificando mensaje: {e}")
+        observe_handler(started)
+        await route_failure(message, exchange, f"EventDecodeError: {e}", retriable=False)
+
+    except Exception as e:
+        logger.error(f"Error procesando mensaje: {e}")
+        observe_handler(started)
+        await route_failure(message, exchange, f"{type(e).__name__}: {e}", retriable=True)
+
+
+async def route_failure(
+    message: aio_pika.abc.AbstractIncomingMessage,
+    exchange: aio_pika.abc.AbstractExchange,
+    error: str,
+    retriable: bool
+):
+    """Publicar en la cola de espera del siguiente intento (o la DLQ) y confirmar el original"""
+    destination, headers = failure_route(QUEUE_NAME, message.headers, error, retriable=retriable)
+    try:
+        confirmation = await exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                content_type=message.content_type,
+                content_encoding=message.content_encoding,
+                message_id=message.message_id,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+            ),
+            routing_key=destination,
+            mandatory=True
+        )
+        if not isinstance(confirmation, Basic.Ack):
+            # El original solo se confirma si el broker aceptó la copia
+            raise RuntimeError(f"Copia no confirmada por el broker: {type(confirmation).__name__}")
+        await message.ack()
+        record_message("failed" if destination == dead_letter_queue_name(QUEUE_NAME) else "requeued")
+        logger.warning(f"Mensaje enviado a {destination}")
+    except Exception as e:
+        logger.error(f"No se pudo enviar el mensaje a {destination}: {e}")
+        if message.channel.is_closed:
+            # Canal cerrado: el broker re-entregará el mensaje tras reconectar
+            return
+        # Copia rechazada (nack), no enrutable (on_return_raises) o sin confirm
+        # con el canal abierto: devolver el original a la cola para no retener
+        # su slot de prefetch
+        try:
+            await message.nack(requeue=True)
+            record_message("requeued")
+        except Exception as nack_error:
+            logger.error(f"No se pudo devolver el mensaje a la cola: {nack_error}")
+
+
+async def consume(queue: aio_pika.abc.AbstractQueue, confirmer: AsyncConfirmationBatcher):
+    """Lanzar una task por mensaje hasta que se cierre la conexión"""
+    in_flight = set()
+    exchange = queue.channel.default_exchange
+    try:
+        async with queue.iterator() as messages:
+            async for message in messages:
+                task = asyncio.create_task(handle_message(message, confirmer, exchange))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+    finally:
+        if in_flight:
+            # Dar tiempo a las notificaciones en curso antes de salir
+            logger.info(f"Esperando {len(in_flight)} mensajes en curso...")
+            await asyncio.wait(in_flight, timeout=SHUTDOWN_GRACE_PERIOD)
+
+
+async def start_async_consumer():
+    """Iniciar consumer asyncio de notificaciones"""
+    logger.info("Notifications Service (asyncio) iniciado")
+
+    # Métricas y profundidad de colas (conexión propia, hilos daemon)
+    start_metrics_server()
+    QueueProbe(build_connection_parameters, [QUEUE_NAME, dead_letter_queue_name(QUEUE_NAME)]).start()
+
+    async with httpx.AsyncClient(
+        base_url=ORDERS_SERVICE_URL,
+        timeout=ORDERS_API_TIMEOUT,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    ) as client:
+        # ✨ Confirmaciones agrupadas en PATCH /api/orders/status
+        confirmer = AsyncConfirmationBatcher(client)
+        confirmer.start()
+        try:
+            await consume_forever(confirmer)
+        finally:
+            await confirmer.stop()
+
+
+async def consume_forever(confirmer: AsyncConfirmationBatcher):
+    """Consumir con reconexión automática"""
+    consecutive_errors = 0
+    max_consecutive_errors = 3
+
+    while True:  # ✨ Loop infinito para reconexión automática
+        connection = None
+        try:
+            connection, queue = await connect_to_rabbitmq()
+            consecutive_errors = 0
+
+            logger.info(f"Notifications Service listo - Prefetch: {ASYNC_CONSUMER_PREFETCH}")
+            logger.info("Esperando pedidos...")
+
+            await consume(queue, confirmer)
+            raise ConnectionError("El consumo terminó: conexión cerrada")
+
+        except asyncio.CancelledError:
+            logger.info("Consumer detenido")
+            raise
+
+        except Exception as e:
+            consecutive_errors += 1
+            logger.error(f"Error en consumer: {e}")
+
+            if consecutive_errors >= max_consecutive_errors:
+                logger.error("Demasiados errores - verificar configuración")
+                await asyncio.sleep(30)
+            else:
+                logger.error(f"Reintentando en 15 segundos... ({consecutive_errors}/{max_consecutive_errors})")
+                await asyncio.sleep(15)
+
+        finally:
+            if connection is not None and not connection.is_closed:
+                await connection.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(start_async_consumer())
+    except KeyboardInterrupt:
+        pass
+    logger.info("Notifications Service finalizado")
@@ -0,0 +1,108 @@
+"""
+CLI para inspeccionar y reinyectar dead letters de orders_queue.
+
+Uso:
+    python dlq.py list [--limit 20]
+    python dlq.py replay [--limit 100]
+"""
+import json
+import argparse
+
+import pika
+
+from consumer import QUEUE_NAME, connect_to_rabbitmq
+from utils.codec import decode_event, EventDecodeError
+from utils.retry import (
+    DEAD_LETTER_REASON_HEADER,
+    LAST_ERROR_HEADER,
+    RETRY_COUNT_HEADER,
+    dead_letter_queue_name,
+    replay_headers
+)
+
+DLQ_NAME = dead_letter_queue_name(QUEUE_NAME)
+
+
+def _preview(body: bytes, properties, size: int = 120) -> str:
+    try:
+        text = json.dumps(decode_event(body, properties.content_type, properties.content_encoding), ensure_ascii=False)
+    except EventDecodeError:
+        text = body.decode("utf-8", errors="replace")
+    return text if len(text) <= size else f"{text[:size]}..."
+
+
+def list_dead_letters(channel, limit: int):
+    """Mostrar los primeros mensajes de la DLQ sin consumirlos"""
+    depth = channel.queue_declare(queue=DLQ_NAME, passive=True).method.message_count
+    print(f"{DLQ_NAME}: {depth} mensajes")
+
+    shown = 0
+    while shown < limit:
+        method, properties, body = channel.basic_get(queue=DLQ_NAME, auto_ack=False)
+        if method is None:
+            break
+        shown += 1
+        headers = properties.headers or {}
+        print(
+            f"- message_id={properties.message_id} "
+            f"intentos={headers.get(RETRY_COUNT_HEADER, 0)} "
+            f"motivo={headers.get(DEAD_LETTER_REASON_HEADER)} "
+            f"error={headers.get(LAST_ERROR_HEADER)}"
+        )
+        print(f"  {_preview(body, properties)}")
+
+    if shown:
+        # Devolver todo a la DLQ: solo era una inspección
+        channel.basic_nack(delivery_tag=0, multiple=True, requeue=True)
+
+
+def replay_dead_letters(channel, limit: int) -> int:
+    """Reinyectar dead letters en orders_queue con el contador de intentos a cero"""
+    # El canal de connect_to_rabbitmq ya tiene confirms habilitados
+    replayed = 0
+    while replayed < limit:
+        method, properties, body = channel.basic_get(queue=DLQ_NAME, auto_ack=False)
+        if method is None:
+            break
+        channel.basic_publish(
+            exchange="",
+            routing_key=QUEUE_NAME,
+            body=body,
+            properties=pika.BasicProperties(
+                content_type=properties.content_type,
+                content_encoding=properties.content_encoding,
+                message_id=properties.message_id,
+                delivery_mode=2,
+                headers=replay_headers(properties.headers)
+            ),
+            mandatory=True
+        )
+        # Solo se elimina de la DLQ cuando el broker confirmó la publicación
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        replayed += 1
+
+    print(f"{replayed} mensajes reinyectados en {QUEUE_NAME}")
+    return replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Dead letters de {QUEUE_NAME}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="Inspeccionar la DLQ sin consumirla")
+    list_parser.add_argument("--limit", type=int, default=20)
+    replay_parser = subparsers.add_parser("replay", help=f"Reinyectar mensajes en {QUEUE_NAME}")
+    replay_parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    connection, channel = connect_to_rabbitmq()
+    try:
+        if args.command == "list":
+            list_dead_letters(channel, args.limit)
+        else:
+            replay_dead_letters(channel, args.limit)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
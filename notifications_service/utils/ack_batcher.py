@@ -0,0 +1,87 @@
+import os
+import logging
+from typing import List, Set
+
+logger = logging.getLogger(__name__)
+
+# ACKs acumulados: se envía un único basic_ack(multiple=True) al llegar a
+# ACK_BATCH_SIZE mensajes terminados o tras ACK_BATCH_INTERVAL_MS
+ACK_BATCH_SIZE = max(1, int(os.getenv("ACK_BATCH_SIZE", "1")))
+ACK_BATCH_INTERVAL = float(os.getenv("ACK_BATCH_INTERVAL_MS", "200")) / 1000
+
+
+class AckBatcher:
+    """
+    Confirmaciones por lotes para un canal de pika.
+
+    Un ACK múltiple confirma todas las entregas hasta un delivery tag, así que
+    solo se envía hasta la marca de agua: el mayor tag terminado sin ninguna
+    entrega anterior todavía en proceso. Los handlers concurrentes pueden
+    terminar en cualquier orden sin confirmar mensajes ajenos.
+
+    No es thread-safe: todos los métodos se llaman en el hilo de la conexión.
+    """
+
+    def __init__(self, connection, channel, batch_size: int = ACK_BATCH_SIZE, interval: float = ACK_BATCH_INTERVAL):
+        self._connection = connection
+        self._channel = channel
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self._in_progress: Set[int] = set()
+        self._done: List[int] = []
+        self._timer = None
+
+    def track(self, delivery_tag: int):
+        """Registrar una entrega recibida antes de procesarla"""
+        self._in_progress.add(delivery_tag)
+
+    def settle(self, delivery_tag: int, ack: bool, requeue: bool = False):
+        """Resultado de un mensaje: el ACK se acumula, el NACK se envía al momento"""
+        self._in_progress.discard(delivery_tag)
+        if not self._channel.is_open:
+            # El canal se cerró (reconexión): el broker re-entregará el mensaje
+            logger.warning(f"Canal cerrado - mensaje {delivery_tag} pendiente de re-entrega")
+            return
+
+        if ack:
+            self._done.append(delivery_tag)
+        else:
+            # Un NACK múltiple rechazaría también mensajes ya procesados
+            self._channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+
+        if len(self._done) >= self.batch_size:
+            self.flush()
+        elif self._done and self._timer is None:
+            self._timer = self._connection.call_later(self.interval, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Enviar el ACK múltiple hasta la marca de agua; devuelve cuántos confirmó"""
+        if not self._done:
+            return 0
+        if not self._channel.is_open:
+            logger.warning(f"Canal cerrado - {len(self._done)} ACKs pendientes se re-entregarán")
+            self._done = []
+            return 0
+
+        watermark = min(self._in_progress) if self._in_progress else None
+        ready = [tag for tag in self._done if watermark is None or tag < watermark]
+        if not ready:
+            return 0
+
+        self._channel.basic_ack(delivery_tag=max(ready), multiple=True)
+        self._done = [tag for tag in self._done if watermark is not None and tag > watermark]
+        return len(ready)
+
+    def close(self):
+        """Enviar los ACKs acumulados antes de cerrar o reconectar"""
+        if self._timer is not None:
+            try:
+                self._connection.remove_timeout(self._timer)
+            except Exception:
+                pass
+            self._timer = None
+        self.flush()
@@ -0,0 +1,95 @@
+import os
+import math
+import time
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Concurrencia adaptativa: ajusta mensajes en vuelo (prefetch) según la cola
+CONSUMER_AUTOSCALE = os.getenv("CONSUMER_AUTOSCALE", "false").lower() == "true"
+CONSUMER_MIN_WORKERS = max(1, int(os.getenv("CONSUMER_MIN_WORKERS", "1")))
+CONSUMER_MAX_WORKERS = max(CONSUMER_MIN_WORKERS, int(os.getenv("CONSUMER_MAX_WORKERS", "32")))
+AUTOSCALE_INTERVAL = float(os.getenv("AUTOSCALE_INTERVAL", "5"))
+# Tiempo objetivo para vaciar el backlog acumulado
+AUTOSCALE_TARGET_DRAIN_SECONDS = float(os.getenv("AUTOSCALE_TARGET_DRAIN_SECONDS", "30"))
+# Muestras seguidas por debajo del umbral antes de reducir
+AUTOSCALE_SCALE_DOWN_SAMPLES = max(1, int(os.getenv("AUTOSCALE_SCALE_DOWN_SAMPLES", "3")))
+AUTOSCALE_SCALE_DOWN_COOLDOWN = float(os.getenv("AUTOSCALE_SCALE_DOWN_COOLDOWN", "30"))
+
+# Margen sobre la concurrencia de régimen (ley de Little) para absorber picos
+HEADROOM = 1.2
+# Solo se reduce si el objetivo queda por debajo de esta fracción del actual
+SCALE_DOWN_RATIO = 0.5
+
+
+class ConcurrencyAutoscaler:
+    """
+    Decide la concurrencia a partir de la profundidad de la cola, la latencia
+    del handler y el throughput.
+
+    Objetivo = throughput·latencia·HEADROOM (lo necesario en régimen) +
+    backlog·latencia/AUTOSCALE_TARGET_DRAIN_SECONDS (vaciar lo acumulado).
+
+    Histéresis: se sube de inmediato hasta el objetivo, pero solo se baja
+    cuando el objetivo queda por debajo de la mitad durante varias muestras
+    seguidas y pasó el cooldown, y a lo sumo a la mitad por paso.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = CONSUMER_MIN_WORKERS,
+        maximum: int = CONSUMER_MAX_WORKERS,
+        drain_seconds: float = AUTOSCALE_TARGET_DRAIN_SECONDS,
+        scale_down_samples: int = AUTOSCALE_SCALE_DOWN_SAMPLES,
+        cooldown: float = AUTOSCALE_SCALE_DOWN_COOLDOWN
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current = self._clamp(initial)
+        self.drain_seconds = drain_seconds
+        self.scale_down_samples = scale_down_samples
+        self.cooldown = cooldown
+        self._low_samples = 0
+        self._last_change = time.monotonic()
+
+    def _clamp(self, value: int) -> int:
+        return max(self.minimum, min(self.maximum, value))
+
+    def target(self, depth: int, latency: float, rate: float) -> int:
+        """Concurrencia necesaria para la carga observada"""
+        steady = rate * latency * HEADROOM
+        backlog = depth * latency / self.drain_seconds
+        return self._clamp(math.ceil(steady + backlog))
+
+    def decide(self, depth: Optional[int], latency: Optional[float], rate: float) -> Optional[int]:
+        """Nueva concurrencia, o None si no hay que cambiar"""
+        if depth is None or latency is None:
+            # Sin muestras todavía: mantener la configuración inicial
+            return None
+
+        target = self.target(depth, latency, rate)
+
+        if target > self.current:
+            self._low_samples = 0
+            return self._apply(target)
+
+        if target < self.current * SCALE_DOWN_RATIO:
+            self._low_samples += 1
+            cooled_down = time.monotonic() - self._last_change >= self.cooldown
+            if self._low_samples >= self.scale_down_samples and cooled_down:
+                self._low_samples = 0
+                return self._apply(max(target, self.current // 2))
+            return None
+
+        self._low_samples = 0
+        return None
+
+    def _apply(self, value: int) -> Optional[int]:
+        value = self._clamp(value)
+        if value == self.current:
+            return None
+        self.current = value
+        self._last_change = time.monotonic()
+        return value
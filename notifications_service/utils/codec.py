@@ -0,0 +1,42 @@
+import gzip
+import json
+import zlib
+from typing import Any, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack es opcional
+    msgpack = None
+
+MSGPACK_CONTENT_TYPES = {"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"}
+
+
+class EventDecodeError(ValueError):
+    """El mensaje no se puede decodificar: reintentar no lo va a arreglar"""
+
+
+def decode_event(body: bytes, content_type: Optional[str] = None, content_encoding: Optional[str] = None) -> Any:
+    """
+    Decodificar un evento según content_type/content_encoding.
+
+    Los mensajes sin content_type (o con application/json) se leen como JSON,
+    así conviven en la cola eventos antiguos y nuevos durante el despliegue.
+    """
+    try:
+        if content_encoding == "gzip":
+            body = gzip.decompress(body)
+        elif content_encoding == "deflate":
+            body = zlib.decompress(body)
+        elif content_encoding not in (None, "", "identity", "utf-8"):
+            raise EventDecodeError(f"content_encoding no soportado: {content_encoding}")
+
+        if content_type in MSGPACK_CONTENT_TYPES:
+            if msgpack is None:
+                raise EventDecodeError("Mensaje msgpack recibido sin el paquete 'msgpack' instalado")
+            return msgpack.unpackb(body, raw=False)
+        return json.loads(body.decode("utf-8"))
+    except EventDecodeError:
+        raise
+    except Exception as e:
+        # JSON, gzip/zlib y msgpack lanzan cada uno sus propias excepciones
+        raise EventDecodeError(f"{type(e).__name__}: {e}") from e
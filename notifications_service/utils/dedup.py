@@ -0,0 +1,114 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# IDs de mensajes ya procesados: LRU en memoria y, opcionalmente, SQLite local
+# para sobrevivir a reinicios del consumer
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_MAX_SIZE = max(1, int(os.getenv("DEDUP_MAX_SIZE", "100000")))
+DEDUP_DB_PATH = os.getenv("DEDUP_DB_PATH", "")
+
+# Cada cuántas inserciones se recorta la tabla a DEDUP_MAX_SIZE filas
+_PRUNE_EVERY = 1000
+
+
+class DedupStore:
+    """
+    Registro acotado de message_id procesados.
+
+    Es thread-safe: lo comparten los workers del consumer. Con `db_path`
+    los IDs se guardan también en SQLite (WAL) y una falla de la LRU se
+    consulta allí antes de darse por nueva.
+    """
+
+    def __init__(self, max_size: int = DEDUP_MAX_SIZE, db_path: str = DEDUP_DB_PATH):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._inserts = 0
+        self.duplicates = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS processed_messages ("
+                "message_id TEXT PRIMARY KEY, processed_at REAL NOT NULL)"
+            )
+            logger.info(f"Dedup persistente en {db_path}")
+
+    @property
+    def persistent(self) -> bool:
+        """True si las consultas tocan SQLite (I/O bloqueante)"""
+        return self._db is not None
+
+    def seen(self, message_id: str) -> bool:
+        """True si el mensaje ya se procesó (y cuenta el duplicado)"""
+        with self._lock:
+            if message_id in self._entries:
+                self._entries.move_to_end(message_id)
+                self.duplicates += 1
+                return True
+            if self._db is not None and self._db.execute(
+                "SELECT 1 FROM processed_messages WHERE message_id = ?", (message_id,)
+            ).fetchone():
+                self._remember(message_id)
+                self.duplicates += 1
+                return True
+            return False
+
+    def mark(self, message_id: str):
+        """Registrar un mensaje procesado correctamente"""
+        with self._lock:
+            self._remember(message_id)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO processed_messages (message_id, processed_at) VALUES (?, ?)",
+                    (message_id, time.time())
+                )
+                self._inserts += 1
+                if self._inserts % _PRUNE_EVERY == 0:
+                    self._prune()
+
+    def _remember(self, message_id: str):
+        self._entries[message_id] = None
+        self._entries.move_to_end(message_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _prune(self):
+        """Mantener en SQLite solo los DEDUP_MAX_SIZE más recientes"""
+        self._db.execute(
+            "DELETE FROM processed_messages WHERE rowid <= "
+            "(SELECT MAX(rowid) FROM processed_messages) - ?",
+            (self.max_size,)
+        )
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_store: Optional[DedupStore] = None
+_store_lock = threading.Lock()
+
+
+def get_dedup_store() -> Optional[DedupStore]:
+    """Store compartido (None si DEDUP_ENABLED=false)"""
+    global _store
+    if not DEDUP_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = DedupStore()
+        return _store
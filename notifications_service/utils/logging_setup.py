@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import zlib
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from utils.metrics import LOG_RECORDS_DROPPED
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+# Configuración de logging: formato, modo no bloqueante y muestreo por mensaje
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text | json
+# Con LOG_ASYNC=true el hilo que loguea solo encola el registro; un listener
+# en segundo plano lo formatea y lo escribe
+LOG_ASYNC = os.getenv("LOG_ASYNC", "false").lower() == "true"
+LOG_QUEUE_SIZE = max(1, int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+# Fracción de pedidos con log detallado por mensaje (errores siempre)
+MESSAGE_LOG_SAMPLE_RATE = min(1.0, max(0.0, float(os.getenv("MESSAGE_LOG_SAMPLE_RATE", "1"))))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Una línea JSON por registro: ts, level, logger, msg y los campos
+    estructurados pasados con `extra={"fields": {...}}`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return _dumps(entry)
+
+
+def _dumps(entry: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(entry, default=str).decode("utf-8")
+    return json.dumps(entry, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler que nunca bloquea ni formatea en el hilo que loguea.
+
+    `prepare` solo resuelve el mensaje y la traza (no pueden viajar entre
+    hilos de forma segura); el formato final lo aplica el listener. Con la
+    cola llena el registro se descarta y se cuenta en `dropped` y en la
+    métrica LOG_RECORDS_DROPPED.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, non_blocking: bool = LOG_ASYNC):
+    """
+    Configurar el logging raíz del proceso (reemplaza a logging.basicConfig).
+
+    En modo no bloqueante el handler de stderr corre en un QueueListener que
+    se detiene (vaciando la cola) al salir del proceso.
+    """
+    global _listener, _queue_handler
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    if log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if not non_blocking:
+        root.addHandler(stream_handler)
+        return None
+
+    if _listener is not None:
+        _listener.stop()
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    root.addHandler(queue_handler)
+    _queue_handler = queue_handler
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Vaciar la cola, detener el listener e informar los registros descartados (idempotente)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        if _queue_handler is not None and _queue_handler.dropped:
+            # El listener ya no escribe: se reporta directo a stderr
+            sys.stderr.write(f"⚠️ Logging: {_queue_handler.dropped} registros descartados por cola llena (LOG_QUEUE_SIZE={LOG_QUEUE_SIZE})\n")
+
+
+def log_sampled(key: Any, rate: float = MESSAGE_LOG_SAMPLE_RATE) -> bool:
+    """
+    Muestreo determinista por clave: todas las líneas de un mismo pedido se
+    escriben o se omiten juntas, en cualquier hilo y sin estado compartido.
+    """
+    if rate >= 1.0:
+        return True
+    return zlib.crc32(str(key).encode("utf-8")) % 10000 < rate * 10000
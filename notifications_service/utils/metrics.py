@@ -0,0 +1,127 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+logger = logging.getLogger(__name__)
+
+# Endpoint HTTP embebido con las métricas del consumer (0 = deshabilitado)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+# Ventana para calcular mensajes por segundo
+RATE_WINDOW_SECONDS = 60
+
+MESSAGES = Counter(
+    "notifications_messages_total",
+    "Mensajes atendidos por resultado",
+    ["outcome"]  # processed | duplicate | requeued | failed
+)
+HANDLER_DURATION = Histogram(
+    "notifications_handler_duration_seconds",
+    "Duración del procesamiento de un mensaje (incluye la confirmación al API)",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 1.5, 2, 3, 5, 10, 30)
+)
+LAST_MESSAGE = Gauge(
+    "notifications_last_message_timestamp_seconds",
+    "Momento en que se recibió el último mensaje"
+)
+CONCURRENCY = Gauge(
+    "notifications_consumer_concurrency",
+    "Mensajes en vuelo permitidos (prefetch) en este consumer"
+)
+LOG_RECORDS_DROPPED = Counter(
+    "notifications_log_records_dropped_total",
+    "Registros de log descartados con la cola de logging llena (LOG_ASYNC=true)"
+)
+QUEUE_DEPTH = Gauge(
+    "notifications_queue_messages",
+    "Mensajes listos en la cola (queue_declare pasivo)",
+    ["queue"]
+)
+QUEUE_CONSUMERS = Gauge(
+    "notifications_queue_consumers",
+    "Consumers conectados a la cola",
+    ["queue"]
+)
+
+
+class RateMeter:
+    """Mensajes por segundo en una ventana deslizante (contadores por segundo)"""
+
+    def __init__(self, window: int = RATE_WINDOW_SECONDS):
+        self.window = window
+        self._buckets = deque()
+        self._lock = threading.Lock()
+
+    def mark(self):
+        second = int(time.monotonic())
+        with self._lock:
+            if self._buckets and self._buckets[-1][0] == second:
+                self._buckets[-1][1] += 1
+            else:
+                self._buckets.append([second, 1])
+                self._prune(second)
+
+    def _prune(self, now: int):
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+    def rate(self) -> float:
+        with self._lock:
+            self._prune(int(time.monotonic()))
+            return sum(count for _, count in self._buckets) / self.window
+
+
+class LatencyTracker:
+    """Media móvil exponencial de la duración del handler (para el autoscaler)"""
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self._value = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._value = seconds if self._value is None else (
+                self.alpha * seconds + (1 - self.alpha) * self._value
+            )
+
+    def value(self):
+        with self._lock:
+            return self._value
+
+
+throughput = RateMeter()
+handler_latency = LatencyTracker()
+
+MESSAGES_PER_SECOND = Gauge(
+    "notifications_messages_per_second",
+    f"Mensajes terminados por segundo (últimos {RATE_WINDOW_SECONDS}s)"
+)
+MESSAGES_PER_SECOND.set_function(throughput.rate)
+
+
+def observe_handler(started: float):
+    """Duración de un handler (`started` de time.perf_counter())"""
+    elapsed = time.perf_counter() - started
+    HANDLER_DURATION.observe(elapsed)
+    handler_latency.observe(elapsed)
+
+
+def record_message(outcome: str, started: float = None):
+    """Registrar el resultado de un mensaje"""
+    MESSAGES.labels(outcome).inc()
+    throughput.mark()
+    if started is not None:
+        observe_handler(started)
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> bool:
+    """Servir /metrics en un hilo daemon; no bloquea el consumer"""
+    if not port:
+        return False
+    start_http_server(port)
+    logger.info(f"📊 Métricas disponibles en :{port}/metrics")
+    return True
@@ -0,0 +1,276 @@
+import os
+import queue
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+ORDERS_SERVICE_URL = os.getenv("ORDERS_SERVICE_URL", "http://localhost:8000").rstrip("/")
+ORDERS_API_TIMEOUT = float(os.getenv("ORDERS_API_TIMEOUT", "5"))
+ORDERS_API_RETRIES = int(os.getenv("ORDERS_API_RETRIES", "3"))
+ORDERS_API_POOL_SIZE = int(os.getenv("ORDERS_API_POOL_SIZE", "10"))
+# Máximo de confirmaciones por PATCH /api/orders/status (el API acepta hasta 5000)
+CONFIRM_BATCH_SIZE = max(1, int(os.getenv("CONFIRM_BATCH_SIZE", "200")))
+# Espera máxima de un worker: la llamada en curso más la suya, con reintentos
+CONFIRM_WAIT_TIMEOUT = 2 * ORDERS_API_TIMEOUT * (ORDERS_API_RETRIES + 1)
+
+NOTIFIED = "notified"
+
+# Resultados del endpoint masivo que no se arreglan reintentando
+_FINAL_OUTCOMES = {"updated", "illegal_transition", "not_found", "invalid_id", "duplicate"}
+
+
+def single_confirm_outcome(order_id: str, status_code: int) -> Optional[str]:
+    """
+    Outcome definitivo de PATCH /api/orders/{order_id}/status, o None si la
+    respuesta hay que tratarla con `raise_for_status` (éxito o error reintentable).
+
+    Un 409 indica que el pedido ya avanzó de estado (re-entrega de un mensaje
+    ya confirmado); 400/404 no se arreglan reintentando.
+    """
+    if status_code == 409:
+        logger.info(f"Pedido {order_id} ya estaba notificado")
+        return "illegal_transition"
+    if status_code in (400, 404):
+        logger.warning(f"Pedido {order_id} no se pudo confirmar: HTTP {status_code}")
+        return "invalid_id" if status_code == 400 else "not_found"
+    return None
+
+
+def bulk_confirm_outcomes(order_ids: List[str], payload: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Outcome de cada pedido en la respuesta de PATCH /api/orders/status.
+
+    Lanza RuntimeError si falta algún pedido o su resultado no es definitivo.
+    """
+    outcomes = {
+        result["order_id"]: result["outcome"]
+        for result in payload["data"]["results"]
+    }
+    unexpected = [order_id for order_id in order_ids if outcomes.get(order_id) not in _FINAL_OUTCOMES]
+    if unexpected:
+        raise RuntimeError(f"Respuesta incompleta del orders service para {len(unexpected)} pedidos")
+
+    for order_id, outcome in outcomes.items():
+        if outcome in ("not_found", "invalid_id"):
+            logger.warning(f"Pedido {order_id} no se pudo confirmar: {outcome}")
+    return outcomes
+
+
+def build_session() -> requests.Session:
+    """Sesión keep-alive con pool de conexiones y reintentos con backoff"""
+    retry = Retry(
+        total=ORDERS_API_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        # PATCH es seguro de reintentar: repetir la transición responde 409
+        allowed_methods=frozenset({"PATCH"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=ORDERS_API_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class OrdersClient:
+    """Cliente HTTP del orders service para confirmar notificaciones"""
+
+    def __init__(self, base_url: str = ORDERS_SERVICE_URL, session: Optional[requests.Session] = None):
+        self.base_url = base_url
+        self.session = session or build_session()
+
+    def confirm_notified(self, order_id: str):
+        """
+        PATCH /api/orders/{order_id}/status?new_status=notified
+
+        Un 409 indica que el pedido ya avanzó de estado (re-entrega de un
+        mensaje ya confirmado) y se trata como éxito.
+        """
+        response = self.session.patch(
+            f"{self.base_url}/api/orders/{order_id}/status",
+            params={"new_status": NOTIFIED},
+            timeout=ORDERS_API_TIMEOUT
+        )
+        if single_confirm_outcome(order_id, response.status_code) is not None:
+            return
+        response.raise_for_status()
+
+    def confirm_notified_many(self, order_ids: List[str]) -> Dict[str, str]:
+        """
+        PATCH /api/orders/status con varias confirmaciones en una sola llamada.
+
+        Devuelve el `outcome` de cada pedido; todos son definitivos.
+        """
+        response = self.session.patch(
+            f"{self.base_url}/api/orders/status",
+            json=[{"order_id": order_id, "new_status": NOTIFIED} for order_id in order_ids],
+            timeout=ORDERS_API_TIMEOUT
+        )
+        # 207: actualización parcial, el detalle viene por pedido
+        if response.status_code not in (200, 207):
+            response.raise_for_status()
+        return bulk_confirm_outcomes(order_ids, response.json())
+
+
+class ConfirmationBatcher:
+    """
+    Agrupa las confirmaciones de todos los workers en llamadas masivas.
+
+    Un único hilo envía lo acumulado mientras la llamada anterior estaba en
+    curso: con poco tráfico cada confirmación sale sola y sin espera extra,
+    y con mucho tráfico se agrupan hasta `batch_size` por round trip.
+    """
+
+    def __init__(self, client: Optional[OrdersClient] = None, batch_size: int = CONFIRM_BATCH_SIZE):
+        self.client = client or OrdersClient()
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="orders-confirmations", daemon=True)
+        self._thread.start()
+
+    def confirm(self, order_id: str) -> Future:
+        """Encolar la confirmación; el Future se resuelve al responder el API"""
+        future: Future = Future()
+        self._queue.put((order_id, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._send(batch)
+
+    def _send(self, batch: List[tuple]):
+        try:
+            if len(batch) == 1:
+                self.client.confirm_notified(batch[0][0])
+            else:
+                # Un mismo pedido puede repetirse (re-entregas): se envía una vez
+                self.client.confirm_notified_many(list(dict.fromkeys(order_id for order_id, _ in batch)))
+                logger.info(f"📡 {len(batch)} notificaciones confirmadas en una llamada")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for _, future in batch:
+            future.set_result(True)
+
+
+_confirmer: Optional[ConfirmationBatcher] = None
+_confirmer_lock = threading.Lock()
+
+
+def get_confirmer() -> ConfirmationBatcher:
+    """Batcher de confirmaciones compartido por todos los workers"""
+    global _confirmer
+    with _confirmer_lock:
+        if _confirmer is None:
+            _confirmer = ConfirmationBatcher()
+        return _confirmer
+
+
+class AsyncConfirmationBatcher:
+    """
+    Equivalente asyncio de ConfirmationBatcher para el consumer aio-pika.
+
+    Una task envía lo acumulado mientras la llamada anterior estaba en curso
+    (hasta `batch_size` por PATCH /api/orders/status), así que con cientos de
+    mensajes en vuelo no hay un round trip por pedido. Cada `confirm` se
+    resuelve con el outcome de su pedido.
+    """
+
+    def __init__(self, client, batch_size: int = CONFIRM_BATCH_SIZE):
+        # httpx.AsyncClient con base_url = ORDERS_SERVICE_URL
+        self.client = client
+        self.batch_size = batch_size
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name="orders-confirmations")
+
+    async def stop(self):
+        """Detener la task; las confirmaciones pendientes fallan (el mensaje se reintenta)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Confirmaciones detenidas"))
+
+    async def confirm(self, order_id: str) -> str:
+        """Encolar la confirmación y esperar el outcome de este pedido"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((order_id, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            await self._send(batch)
+
+    async def _send(self, batch: List[tuple]):
+        try:
+            order_ids = list(dict.fromkeys(order_id for order_id, _ in batch))
+            if len(order_ids) == 1:
+                outcomes = {order_ids[0]: await self._confirm_one(order_ids[0])}
+            else:
+                outcomes = await self._confirm_many(order_ids)
+                logger.info(f"📡 {len(batch)} notificaciones confirmadas en una llamada")
+        except asyncio.CancelledError:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Confirmaciones detenidas"))
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for order_id, future in batch:
+            if not future.done():
+                future.set_result(outcomes[order_id])
+
+    async def _confirm_one(self, order_id: str) -> str:
+        response = await self.client.patch(
+            f"/api/orders/{order_id}/status",
+            params={"new_status": NOTIFIED}
+        )
+        outcome = single_confirm_outcome(order_id, response.status_code)
+        if outcome is not None:
+            return outcome
+        response.raise_for_status()
+        return "updated"
+
+    async def _confirm_many(self, order_ids: List[str]) -> Dict[str, str]:
+        response = await self.client.patch(
+            "/api/orders/status",
+            json=[{"order_id": order_id, "new_status": NOTIFIED} for order_id in order_ids]
+        )
+        # 207: actualización parcial, el detalle viene por pedido
+        if response.status_code not in (200, 207):
+            response.raise_for_status()
+        return bulk_confirm_outcomes(order_ids, response.json())
@@ -0,0 +1,97 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+import pika
+
+from utils.metrics import QUEUE_CONSUMERS, QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+QUEUE_PROBE_INTERVAL = float(os.getenv("QUEUE_PROBE_INTERVAL", "5"))
+
+
+class QueueProbe:
+    """
+    Profundidad y consumers de las colas mediante queue_declare pasivo.
+
+    Usa su propia conexión en un hilo daemon: un declare pasivo fallido
+    cierra el canal y no debe afectar al canal que consume.
+    """
+
+    def __init__(
+        self,
+        parameters_factory: Callable[[], pika.ConnectionParameters],
+        queues: Iterable[str],
+        interval: float = QUEUE_PROBE_INTERVAL
+    ):
+        self._parameters_factory = parameters_factory
+        self.queues = list(queues)
+        self.interval = interval
+        self._snapshot: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queue-probe", daemon=True)
+
+    def start(self) -> "QueueProbe":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def depth(self, queue: str) -> Optional[int]:
+        """Última profundidad medida (None si aún no hay muestra)"""
+        with self._lock:
+            sample = self._snapshot.get(queue)
+        return int(sample["messages"]) if sample else None
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {queue: dict(sample) for queue, sample in self._snapshot.items()}
+
+    def _run(self):
+        connection = None
+        while not self._stop.is_set():
+            try:
+                if connection is None or connection.is_closed:
+                    connection = pika.BlockingConnection(self._parameters_factory())
+                channel = connection.channel()
+                for queue in self.queues:
+                    method = channel.queue_declare(queue=queue, passive=True).method
+                    self._record(queue, method.message_count, method.consumer_count)
+                channel.close()
+            except Exception as e:
+                logger.warning(f"No se pudo medir la profundidad de las colas: {e}")
+                if connection is not None and connection.is_open:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+                connection = None
+
+            # Esperar atendiendo heartbeats de la conexión de sondeo
+            deadline = time.monotonic() + self.interval
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                if connection is not None and connection.is_open:
+                    try:
+                        connection.process_data_events(time_limit=min(1.0, self.interval))
+                    except Exception:
+                        connection = None
+                else:
+                    self._stop.wait(min(1.0, self.interval))
+
+        if connection is not None and connection.is_open:
+            connection.close()
+
+    def _record(self, queue: str, messages: int, consumers: int):
+        QUEUE_DEPTH.labels(queue).set(messages)
+        QUEUE_CONSUMERS.labels(queue).set(consumers)
+        with self._lock:
+            self._snapshot[queue] = {
+                "messages": messages,
+                "consumers": consumers,
+                "sampled_at": time.time()
+            }
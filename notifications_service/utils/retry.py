@@ -0,0 +1,84 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Reintentos con backoff exponencial: una cola de espera por intento con TTL
+# fijo que, al expirar, devuelve el mensaje a la cola principal (DLX)
+RETRY_MAX_ATTEMPTS = max(0, int(os.getenv("RETRY_MAX_ATTEMPTS", "5")))
+RETRY_BASE_DELAY_MS = int(os.getenv("RETRY_BASE_DELAY_MS", "1000"))
+RETRY_MAX_DELAY_MS = int(os.getenv("RETRY_MAX_DELAY_MS", "60000"))
+
+RETRY_COUNT_HEADER = "x-retry-count"
+LAST_ERROR_HEADER = "x-last-error"
+DEAD_LETTER_REASON_HEADER = "x-dead-letter-reason"
+ORIGINAL_QUEUE_HEADER = "x-original-queue"
+
+# Cabeceras propias del ciclo de reintentos (se limpian al reinyectar)
+RETRY_HEADERS = (RETRY_COUNT_HEADER, LAST_ERROR_HEADER, DEAD_LETTER_REASON_HEADER, ORIGINAL_QUEUE_HEADER)
+
+
+def retry_queue_name(queue: str, attempt: int) -> str:
+    return f"{queue}.retry.{attempt}"
+
+
+def dead_letter_queue_name(queue: str) -> str:
+    return f"{queue}.dlq"
+
+
+def retry_delay_ms(attempt: int) -> int:
+    """Espera antes del intento `attempt` (1, 2, 4, 8... segundos por defecto)"""
+    return min(RETRY_MAX_DELAY_MS, RETRY_BASE_DELAY_MS * (2 ** (attempt - 1)))
+
+
+def retry_topology(queue: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Colas a declarar (nombre, argumentos) para reintentos y dead letters.
+
+    Cada cola de espera tiene un TTL fijo: con un TTL por mensaje un mensaje
+    largo bloquearía a los que tiene detrás. Cambiar los retardos de una cola
+    ya declarada exige borrarla antes (PRECONDITION_FAILED).
+    """
+    topology = [
+        (retry_queue_name(queue, attempt), {
+            "x-message-ttl": retry_delay_ms(attempt),
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": queue
+        })
+        for attempt in range(1, RETRY_MAX_ATTEMPTS + 1)
+    ]
+    topology.append((dead_letter_queue_name(queue), {}))
+    return topology
+
+
+def retry_count(headers: Optional[Dict[str, Any]]) -> int:
+    return int((headers or {}).get(RETRY_COUNT_HEADER, 0))
+
+
+def failure_route(
+    queue: str,
+    headers: Optional[Dict[str, Any]],
+    error: str,
+    retriable: bool = True
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Destino y cabeceras para un mensaje fallido.
+
+    Va a la siguiente cola de espera mientras queden intentos; los errores no
+    reintentables (p.ej. JSON inválido) y los que agotan los intentos van a
+    la DLQ.
+    """
+    attempt = retry_count(headers) + 1
+    headers = dict(headers or {})
+    headers[LAST_ERROR_HEADER] = error[:500]
+
+    if retriable and attempt <= RETRY_MAX_ATTEMPTS:
+        headers[RETRY_COUNT_HEADER] = attempt
+        return retry_queue_name(queue, attempt), headers
+
+    headers[DEAD_LETTER_REASON_HEADER] = "max_attempts" if retriable else "rejected"
+    headers[ORIGINAL_QUEUE_HEADER] = queue
+    return dead_letter_queue_name(queue), headers
+
+
+def replay_headers(headers: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cabeceras para reinyectar un dead letter con el contador a cero"""
+    return {key: value for key, value in (headers or {}).items() if key not in RETRY_HEADERS}
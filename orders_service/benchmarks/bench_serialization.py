@@ -0,0 +1,79 @@
+"""
+Benchmark de serialización del listado de pedidos (10k documentos).
+
+Compara el camino anterior (conversión en bucle + validación contra
+OrderListResponseModel + jsonable_encoder + json stdlib) con el camino rápido
+(FastJSONResponse con orjson, sin revalidar).
+
+Uso (desde orders_service/):
+    python benchmarks/bench_serialization.py [cantidad] [repeticiones]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.responses import OrderListResponseModel  # noqa: E402
+from utils.response import success_response  # noqa: E402
+from utils.serialization import FastJSONResponse, orjson  # noqa: E402
+
+
+def make_orders(count: int):
+    now = datetime.now()
+    return [
+        {
+            "_id": ObjectId(),
+            "customer_id": f"customer_{i % 500}",
+            "products": ["Laptop Dell XPS 15", "Mouse Logitech MX Master", "Teclado mecánico"],
+            "total_amount": 1499.97 + i,
+            "status": "pending" if i % 3 else "notified",
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now - timedelta(seconds=i // 2)
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_path(orders):
+    """Camino anterior: bucle de conversión + response_model + encoder stdlib"""
+    for order in orders:
+        order["_id"] = str(order["_id"])
+        order["created_at"] = order["created_at"].isoformat()
+        order["updated_at"] = order["updated_at"].isoformat()
+    content = success_response(data=orders, message=f"Se encontraron {len(orders)} pedidos")
+    validated = OrderListResponseModel.model_validate(content)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def fast_path(orders):
+    """Camino rápido: documentos tal cual a orjson"""
+    content = success_response(data=orders, message=f"Se encontraron {len(orders)} pedidos")
+    return FastJSONResponse(content).body
+
+
+def bench(name, func, count, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        orders = make_orders(count)
+        start = time.perf_counter()
+        size = len(func(orders))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{name:<10} mediana {timings[len(timings) // 2]:8.2f} ms | mín {timings[0]:8.2f} ms | {size / 1024:.0f} KiB")
+    return timings[len(timings) // 2]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    print(f"Serializando {count} pedidos ({repeat} repeticiones, orjson={'sí' if orjson else 'no'})")
+    before = bench("antes", legacy_path, count, repeat)
+    after = bench("después", fast_path, count, repeat)
+    print(f"Mejora: {before / after:.1f}x")
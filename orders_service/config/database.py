@@ -1,7 +1,9 @@
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from dotenv import load_dotenv
 import logging
+from typing import Dict, Any, List, Optional
 
 load_dotenv()
 
@@ -9,6 +11,25 @@ logger = logging.getLogger(__name__)
 
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/ordersdb")
 
+# Debug: ejecutar explain() sobre las consultas del listado y avisar de COLLSCAN
+MONGO_EXPLAIN_QUERIES = os.getenv("MONGO_EXPLAIN_QUERIES", "false").lower() == "true"
+
+# Índices de la colección orders. Siguen la regla igualdad → orden → rango:
+# los filtros por igualdad van primero y luego la clave de orden del listado
+# (created_at, _id), de modo que filtrar + paginar nunca requiere COLLSCAN
+ORDER_INDEXES = [
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    IndexModel(
+        [("customer_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+        name="customer_created_at_id"
+    ),
+    IndexModel(
+        [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+        name="status_created_at_id"
+    ),
+    IndexModel([("total_amount", ASCENDING)], name="total_amount"),
+]
+
 client: AsyncIOMotorClient = None
 database = None
 
@@ -22,11 +43,65 @@ async def connect_to_mongo():
         # Test connection
         await client.admin.command('ping')
         logger.info(f"Conectado a MongoDB: {MONGODB_URL}")
+        await ensure_indexes()
     except Exception as e:
         logger.error(f"Error conectando a MongoDB: {e}")
         raise
 
 
+async def ensure_indexes():
+    """Crear los índices que usan las consultas (idempotente)"""
+    names = await database.orders.create_indexes(ORDER_INDEXES)
+    logger.info(f"Índices de MongoDB verificados: {', '.join(names)}")
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Recorrer un plan de explain() y devolver todos sus stages"""
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        # SBE (MongoDB 7) anida el plan en queryPlan
+        for key in ("queryPlan", "inputStage"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+async def check_query_plan(
+    collection,
+    query: Dict[str, Any],
+    sort: Optional[List] = None
+) -> Optional[List[str]]:
+    """
+    Debug: explicar la consulta y avisar si el plan ganador usa COLLSCAN.
+
+    Solo se ejecuta con MONGO_EXPLAIN_QUERIES=true. Devuelve los stages
+    del plan ganador.
+    """
+    if not MONGO_EXPLAIN_QUERIES:
+        return None
+    try:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        if "COLLSCAN" in stages:
+            logger.warning(f"🐢 COLLSCAN en {collection.name} - filtro: {query} - orden: {sort}")
+        else:
+            logger.info(f"🔎 Plan de {collection.name}: {' <- '.join(stages)}")
+        return stages
+    except Exception as e:
+        logger.error(f"Error ejecutando explain: {e}")
+        return None
+
+
 async def close_mongo_connection():
     """Cerrar conexión a MongoDB"""
     global client
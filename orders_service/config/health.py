@@ -0,0 +1,207 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.database import get_database
+from config.outbox import OUTBOX_PENDING
+from config.rabbit import (
+    PoolTimeoutError,
+    get_batch_publisher,
+    get_publisher_pool,
+    probe_broker
+)
+from utils.metrics import DEPENDENCY_LATENCY, DEPENDENCY_UP, track_mongo
+
+logger = logging.getLogger(__name__)
+
+# Probes activos en segundo plano: /health y /ready leen el último resultado
+# en memoria, sin round trips por request
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+# Un resultado más viejo que esto se considera desconocido (el probe se colgó)
+HEALTH_STALE_AFTER = float(os.getenv("HEALTH_STALE_AFTER", str(HEALTH_PROBE_INTERVAL * 3)))
+
+# Umbrales de /ready
+READY_MAX_PUBLISH_PENDING = int(os.getenv("READY_MAX_PUBLISH_PENDING", "1000"))
+READY_MAX_OUTBOX_BACKLOG = int(os.getenv("READY_MAX_OUTBOX_BACKLOG", "5000"))
+
+STATUS_UP = "up"
+STATUS_DOWN = "down"
+STATUS_SATURATED = "saturated"
+STATUS_UNKNOWN = "unknown"
+
+_results: Dict[str, Dict[str, Any]] = {}
+_probe_task: Optional[asyncio.Task] = None
+_ready: Optional[bool] = None
+
+
+def _record(name: str, status: str, started: float, error: Optional[str] = None, **details):
+    """Guardar el resultado de un probe y reflejarlo en /metrics"""
+    latency = time.perf_counter() - started
+    _results[name] = {
+        "status": status,
+        "latency_ms": round(latency * 1000, 2),
+        "checked_at": time.time(),
+        "error": error,
+        **details
+    }
+    DEPENDENCY_UP.labels(name).set(1 if status == STATUS_UP else 0)
+    DEPENDENCY_LATENCY.labels(name).set(latency)
+
+
+async def probe_mongo():
+    """Ping a MongoDB y tamaño del backlog del outbox (acotado)"""
+    started = time.perf_counter()
+    db = get_database()
+    if db is None:
+        _record("mongodb", STATUS_DOWN, started, "Sin conexión inicializada")
+        return
+    try:
+        await asyncio.wait_for(db.command("ping"), timeout=HEALTH_PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        _record("mongodb", STATUS_DOWN, started, f"Timeout ({HEALTH_PROBE_TIMEOUT}s)")
+        return
+    except Exception as e:
+        _record("mongodb", STATUS_DOWN, started, str(e))
+        return
+    _record("mongodb", STATUS_UP, started)
+
+    # Backlog del outbox: solo se cuenta hasta pasar el umbral, por el índice parcial
+    started = time.perf_counter()
+    try:
+        with track_mongo("count_outbox"):
+            backlog = await asyncio.wait_for(
+                db.orders.count_documents(
+                    {"outbox.status": OUTBOX_PENDING},
+                    limit=READY_MAX_OUTBOX_BACKLOG + 1,
+                    hint="outbox_pending"
+                ),
+                timeout=HEALTH_PROBE_TIMEOUT
+            )
+        _record("outbox", STATUS_UP, started, backlog=backlog)
+    except asyncio.TimeoutError:
+        _record("outbox", STATUS_UNKNOWN, started, f"Timeout ({HEALTH_PROBE_TIMEOUT}s)")
+    except Exception as e:
+        _record("outbox", STATUS_UNKNOWN, started, str(e))
+
+
+async def probe_rabbitmq():
+    """queue_declare pasivo por un canal del pool de publicación"""
+    started = time.perf_counter()
+    try:
+        depth = await asyncio.wait_for(
+            asyncio.to_thread(probe_broker, HEALTH_PROBE_TIMEOUT),
+            timeout=HEALTH_PROBE_TIMEOUT * 2
+        )
+        _record("rabbitmq", STATUS_UP, started, queue_depth=depth)
+    except PoolTimeoutError as e:
+        # El broker puede estar bien, pero esta instancia no puede publicar más
+        _record("rabbitmq", STATUS_SATURATED, started, str(e))
+    except asyncio.TimeoutError:
+        _record("rabbitmq", STATUS_DOWN, started, f"Timeout ({HEALTH_PROBE_TIMEOUT * 2}s)")
+    except Exception as e:
+        _record("rabbitmq", STATUS_DOWN, started, str(e) or type(e).__name__)
+
+
+async def run_probes():
+    """Ejecutar todos los probes en paralelo y reevaluar la disponibilidad"""
+    global _ready
+    await asyncio.gather(probe_mongo(), probe_rabbitmq())
+
+    ready, reasons = readiness()
+    if ready != _ready:
+        if ready:
+            logger.info("✅ Instancia lista para recibir tráfico")
+        else:
+            logger.warning(f"⚠️ Instancia no lista: {'; '.join(reasons)}")
+        _ready = ready
+
+
+async def _probe_loop():
+    while True:
+        await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+        try:
+            await run_probes()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error ejecutando health probes: {e}")
+
+
+def _fresh(name: str) -> Dict[str, Any]:
+    """Último resultado de un probe, marcado como desconocido si está vencido"""
+    result = _results.get(name)
+    if result is None:
+        return {"status": STATUS_UNKNOWN, "error": "Sin probes todavía"}
+    if time.time() - result["checked_at"] > HEALTH_STALE_AFTER:
+        return {**result, "status": STATUS_UNKNOWN, "error": "Resultado vencido"}
+    return result
+
+
+def publisher_stats() -> Dict[str, Any]:
+    """Estado en memoria de los publicadores (sin I/O)"""
+    stats: Dict[str, Any] = {}
+    pool = get_publisher_pool()
+    if pool is not None:
+        stats["pool"] = pool.stats()
+    batch = get_batch_publisher()
+    if batch is not None:
+        stats["batch"] = {"ready": batch.is_ready(), "pending": batch.pending()}
+    return stats
+
+
+def dependency_status() -> Dict[str, Dict[str, Any]]:
+    """Resultados cacheados de todos los probes"""
+    return {name: _fresh(name) for name in ("mongodb", "rabbitmq", "outbox")}
+
+
+def readiness() -> Tuple[bool, List[str]]:
+    """
+    Decidir si la instancia debe recibir tráfico.
+
+    Requiere MongoDB y RabbitMQ disponibles en el último probe, un pool de
+    publicación con canales libres y el backlog de publicación (lote en vuelo
+    y outbox) por debajo de los umbrales READY_MAX_*.
+    """
+    reasons = []
+    dependencies = dependency_status()
+
+    for name in ("mongodb", "rabbitmq"):
+        status = dependencies[name]["status"]
+        if status != STATUS_UP:
+            reasons.append(f"{name}: {status}")
+
+    backlog = dependencies["outbox"].get("backlog")
+    if backlog is not None and backlog > READY_MAX_OUTBOX_BACKLOG:
+        reasons.append(f"outbox: más de {READY_MAX_OUTBOX_BACKLOG} eventos pendientes")
+
+    batch = get_batch_publisher()
+    if batch is not None:
+        if not batch.is_ready():
+            reasons.append("publicador por lotes: sin conexión")
+        elif batch.pending() > READY_MAX_PUBLISH_PENDING:
+            reasons.append(f"publicador por lotes: {batch.pending()} eventos sin confirmar")
+
+    return not reasons, reasons
+
+
+async def start_health_probes():
+    """Primer probe (para no arrancar reportando 'unknown') y loop en segundo plano"""
+    global _probe_task
+    await run_probes()
+    _probe_task = asyncio.create_task(_probe_loop(), name="health-probes")
+    logger.info(f"🩺 Health probes iniciados (cada {HEALTH_PROBE_INTERVAL}s)")
+
+
+async def stop_health_probes():
+    """Detener el loop de probes"""
+    global _probe_task
+    if _probe_task is not None:
+        _probe_task.cancel()
+        try:
+            await _probe_task
+        except asyncio.CancelledError:
+            pass
+        _probe_task = None
@@ -0,0 +1,173 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from pymongo import UpdateOne
+
+from config.database import get_database
+from config.rabbit import publish_order_event_async
+
+logger = logging.getLogger(__name__)
+
+# Outbox embebido en el documento del pedido: se escribe en el mismo insert
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+OUTBOX_MAX_BACKOFF = float(os.getenv("OUTBOX_MAX_BACKOFF", "60"))
+
+OUTBOX_PENDING = "pending"
+OUTBOX_SENT = "sent"
+
+_relay_task: Optional[asyncio.Task] = None
+_wakeup: Optional[asyncio.Event] = None
+
+
+def new_outbox_entry(now: datetime) -> Dict[str, Any]:
+    """Estado inicial del outbox para un pedido recién creado"""
+    return {
+        "status": OUTBOX_PENDING,
+        "attempts": 0,
+        "next_attempt_at": now
+    }
+
+
+def build_order_event(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Construir el evento de RabbitMQ a partir del documento del pedido"""
+    return {
+        "order_id": str(order["_id"]),
+        "customer_id": order["customer_id"],
+        "total_amount": order["total_amount"],
+        "products": order["products"],
+        "timestamp": order["created_at"].isoformat()
+    }
+
+
+def notify_outbox_relay():
+    """Despertar al relay para publicar sin esperar al siguiente sondeo"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def ensure_outbox_index(db):
+    """Índice parcial: solo los eventos pendientes ocupan espacio"""
+    await db.orders.create_index(
+        [("outbox.next_attempt_at", 1)],
+        name="outbox_pending",
+        partialFilterExpression={"outbox.status": OUTBOX_PENDING}
+    )
+
+
+async def relay_pending_events() -> int:
+    """
+    Publicar un lote de eventos pendientes y marcarlos como enviados.
+
+    Devuelve cuántos eventos se confirmaron. Los fallidos se reintentan
+    con backoff exponencial (entrega at-least-once); tras el primer fallo el
+    resto del lote se pospone sin intentarse.
+    """
+    db = get_database()
+    now = datetime.now()
+
+    cursor = db.orders.find(
+        {"outbox.status": OUTBOX_PENDING, "outbox.next_attempt_at": {"$lte": now}},
+        {"customer_id": 1, "total_amount": 1, "products": 1, "created_at": 1, "outbox": 1}
+    ).sort("outbox.next_attempt_at", 1).limit(OUTBOX_BATCH_SIZE)
+    pending: List[Dict[str, Any]] = await cursor.to_list(length=OUTBOX_BATCH_SIZE)
+
+    if not pending:
+        return 0
+
+    tasks = [
+        asyncio.ensure_future(publish_order_event_async(build_order_event(order)))
+        for order in pending
+    ]
+    # Al primer fallo se cancela lo que aún no empezó: con el broker caído cada
+    # publicación agota sus reintentos y el pase se alargaría minutos. Lo
+    # cancelado vuelve a intentarse con el backoff normal
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            result = await next_done
+        except Exception:
+            result = False
+        if result is not True:
+            for task in tasks:
+                task.cancel()
+            break
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    skipped = sum(1 for result in results if isinstance(result, asyncio.CancelledError))
+    if skipped:
+        logger.warning(f"📤 Outbox: fallo publicando, {skipped} eventos pospuestos sin intentar")
+
+    now = datetime.now()
+    operations = []
+    sent = 0
+    for order, result in zip(pending, results):
+        if result is True:
+            sent += 1
+            operations.append(UpdateOne(
+                {"_id": order["_id"]},
+                {"$set": {"outbox.status": OUTBOX_SENT, "outbox.sent_at": now}}
+            ))
+        else:
+            attempts = order["outbox"].get("attempts", 0) + 1
+            backoff = min(OUTBOX_MAX_BACKOFF, OUTBOX_POLL_INTERVAL * (2 ** attempts))
+            operations.append(UpdateOne(
+                {"_id": order["_id"]},
+                {"$set": {
+                    "outbox.attempts": attempts,
+                    "outbox.next_attempt_at": now + timedelta(seconds=backoff)
+                }}
+            ))
+
+    await db.orders.bulk_write(operations, ordered=False)
+
+    failed = len(pending) - sent
+    if failed:
+        logger.warning(f"📤 Outbox: {sent} eventos publicados, {failed} pendientes de reintento")
+    else:
+        logger.info(f"📤 Outbox: {sent} eventos publicados")
+    return sent
+
+
+async def _relay_loop():
+    """Loop del relay: drena lotes y espera nuevos pedidos o el siguiente sondeo"""
+    while True:
+        try:
+            _wakeup.clear()
+            sent = await relay_pending_events()
+            if sent >= OUTBOX_BATCH_SIZE:
+                # Probablemente quedan más pendientes: seguir drenando
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error en relay de outbox: {e}")
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_outbox_relay():
+    """Crear índice del outbox e iniciar el relay en segundo plano"""
+    global _relay_task, _wakeup
+    await ensure_outbox_index(get_database())
+    _wakeup = asyncio.Event()
+    _relay_task = asyncio.create_task(_relay_loop(), name="outbox-relay")
+    logger.info("📤 Relay de outbox iniciado")
+
+
+async def stop_outbox_relay():
+    """Detener el relay (los pendientes se publican en el próximo arranque)"""
+    global _relay_task, _wakeup
+    if _relay_task is not None:
+        _relay_task.cancel()
+        try:
+            await _relay_task
+        except asyncio.CancelledError:
+            pass
+        _relay_task = None
+        _wakeup = None
+        logger.info("📤 Relay de outbox detenido")
@@ -1,21 +1,42 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import logging
 
 from config.database import connect_to_mongo, close_mongo_connection
 from config.rabbit import connect_to_rabbitmq, close_rabbitmq_connection
+from config.outbox import start_outbox_relay, stop_outbox_relay
+from config.health import (
+    STATUS_UP,
+    dependency_status,
+    publisher_stats,
+    readiness,
+    start_health_probes,
+    stop_health_probes
+)
 from routes.orders import router as orders_router
 from utils.middleware import setup_exception_handlers
-from utils.response import success_response
+from utils.response import error_response, success_response
+from utils.cache import order_cache
+from utils.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    render_metrics,
+    route_label
+)
+from utils.logging_setup import (
+    ACCESS_LOG_SLOW_MS,
+    access_log_fields,
+    access_log_sampled,
+    setup_logging
+)
 from models.responses import HealthResponseModel
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configurar logging (LOG_FORMAT=json, LOG_ASYNC=true para el modo no bloqueante)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -24,12 +45,17 @@ async def lifespan(app: FastAPI):
     """Gestionar el ciclo de vida de la aplicación"""
     # Startup
     await connect_to_mongo()
-    connect_to_rabbitmq()
+    await asyncio.to_thread(connect_to_rabbitmq)
+    await start_outbox_relay()
+    await start_health_probes()
     logger.info("🚀 Orders Service iniciado")
     yield
     # Shutdown
+    await stop_health_probes()
+    await stop_outbox_relay()
     await close_mongo_connection()
-    close_rabbitmq_connection()
+    await asyncio.to_thread(close_rabbitmq_connection)
+    await order_cache.close()
     logger.info("👋 Orders Service finalizado")
 
 
@@ -50,37 +76,59 @@ setup_exception_handlers(app)
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """
-    Middleware que mide el tiempo de respuesta de cada request
-    y lo registra en los logs
+    Middleware que mide el tiempo de respuesta de cada request,
+    lo registra en los logs y en las métricas de /metrics.
+    
+    El log de acceso se muestrea con ACCESS_LOG_SAMPLE_RATE; los errores
+    y los requests más lentos que ACCESS_LOG_SLOW_MS se registran siempre.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    sampled = access_log_sampled()
     
     # Log del request
-    logger.info(f"📥 {request.method} {request.url.path}")
+    if sampled:
+        logger.info(f"📥 {request.method} {request.url.path}")
     
     try:
         response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
+        elapsed = time.perf_counter() - start_time
+        process_time = elapsed * 1000
         
         # Agregar header con tiempo de respuesta
         response.headers["X-Process-Time-Ms"] = str(round(process_time, 2))
         
+        route = route_label(request)
+        HTTP_REQUEST_DURATION.labels(request.method, route).observe(elapsed)
+        HTTP_REQUESTS.labels(request.method, route, response.status_code).inc()
+        
         # Log del response
-        logger.info(
-            f"📤 {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {round(process_time, 2)}ms"
-        )
+        if sampled or response.status_code >= 500 or process_time >= ACCESS_LOG_SLOW_MS:
+            logger.info(
+                f"📤 {request.method} {request.url.path} - "
+                f"Status: {response.status_code} - "
+                f"Time: {round(process_time, 2)}ms",
+                extra={"fields": access_log_fields(request.method, request.url.path, response.status_code, process_time)}
+            )
         
         return response
     except Exception as e:
-        process_time = (time.time() - start_time) * 1000
+        elapsed = time.perf_counter() - start_time
+        process_time = elapsed * 1000
+        
+        route = route_label(request)
+        HTTP_REQUEST_DURATION.labels(request.method, route).observe(elapsed)
+        HTTP_REQUESTS.labels(request.method, route, 500).inc()
+        
         logger.error(
             f"❌ {request.method} {request.url.path} - "
             f"Error: {str(e)} - "
-            f"Time: {round(process_time, 2)}ms"
+            f"Time: {round(process_time, 2)}ms",
+            extra={"fields": access_log_fields(request.method, request.url.path, 500, process_time)}
         )
         raise
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
 
 
 # Incluir routers
@@ -123,32 +171,68 @@ async def detailed_health_check():
     Health Check Detallado
     
     Verifica el estado del servicio y sus conexiones:
-    - MongoDB
-    - RabbitMQ
+    - MongoDB (ping)
+    - RabbitMQ (queue_declare pasivo por el pool de publicación)
+    
+    Los resultados salen del último probe en segundo plano
+    (HEALTH_PROBE_INTERVAL), con su latencia medida.
     """
-    from config.database import get_database
+    dependencies = dependency_status()
+    ready, reasons = readiness()
     
     health_status = {
         "service": "Orders Service",
         "version": "1.0.0",
-        "mongodb": "disconnected",
-        "rabbitmq": "disconnected"
+        "status": "healthy" if ready else "degraded",
+        "mongodb": "connected" if dependencies["mongodb"]["status"] == STATUS_UP else "disconnected",
+        "rabbitmq": "connected" if dependencies["rabbitmq"]["status"] == STATUS_UP else "disconnected",
+        "dependencies": dependencies,
+        "publishers": publisher_stats()
     }
+    if reasons:
+        health_status["reasons"] = reasons
     
-    # Verificar MongoDB
-    try:
-        db = get_database()
-        if db is not None:
-            health_status["mongodb"] = "connected"
-    except Exception as e:
-        logger.error(f"MongoDB health check failed: {e}")
-    
-    # Verificar RabbitMQ
-    from config.rabbit import connection
-    if connection and not connection.is_closed:
-        health_status["rabbitmq"] = "connected"
+    # Estadísticas del cache de pedidos
+    health_status["order_cache"] = order_cache.stats()
     
     return success_response(
         data=health_status,
         message="Health check completado"
     )
+
+
+@app.get(
+    "/ready",
+    tags=["health"],
+    response_model=HealthResponseModel,
+    summary="Readiness",
+    description="200 si la instancia puede recibir tráfico, 503 si está degradada"
+)
+async def readiness_check():
+    """
+    Readiness para load balancers
+    
+    Sin I/O: combina el último resultado de los probes con el estado en
+    memoria de los publicadores, así que se puede consultar seguido.
+    """
+    ready, reasons = readiness()
+    if not ready:
+        return JSONResponse(
+            status_code=503,
+            content=error_response(
+                message="Orders Service no está listo",
+                status_code=503,
+                data={"ready": False, "reasons": reasons}
+            )
+        )
+    return success_response(
+        data={"ready": True},
+        message="Orders Service listo"
+    )
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics():
+    """Métricas en formato Prometheus (latencias, status codes, MongoDB, RabbitMQ)"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,9 +1,34 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List
+from typing import Dict, List
 from datetime import datetime
+from enum import Enum
 from bson import ObjectId
 
 
+class OrderStatus(str, Enum):
+    """Estados del pedido"""
+    PENDING = "pending"
+    NOTIFIED = "notified"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+# Máquina de estados: estado destino -> estados desde los que se puede llegar
+# pending → notified → processing → completed / cancelled
+ORDER_STATUS_TRANSITIONS: Dict[OrderStatus, List[OrderStatus]] = {
+    OrderStatus.NOTIFIED: [OrderStatus.PENDING],
+    OrderStatus.PROCESSING: [OrderStatus.NOTIFIED],
+    OrderStatus.COMPLETED: [OrderStatus.PROCESSING],
+    OrderStatus.CANCELLED: [OrderStatus.PENDING, OrderStatus.NOTIFIED, OrderStatus.PROCESSING],
+}
+
+
+def allowed_previous_statuses(new_status: OrderStatus) -> List[str]:
+    """Estados de origen válidos para pasar a `new_status`"""
+    return [status.value for status in ORDER_STATUS_TRANSITIONS.get(new_status, [])]
+
+
 class PyObjectId(ObjectId):
     """Custom type for MongoDB ObjectId"""
     @classmethod
@@ -38,6 +63,21 @@ class OrderCreate(BaseModel):
     )
 
 
+class OrderStatusUpdate(BaseModel):
+    """Cambio de estado para la actualización masiva"""
+    order_id: str = Field(..., description="ID del pedido")
+    new_status: OrderStatus = Field(OrderStatus.NOTIFIED, description="Estado destino")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "order_id": "507f1f77bcf86cd799439011",
+                "new_status": "notified"
+            }
+        }
+    )
+
+
 class OrderResponse(BaseModel):
     """Modelo de respuesta de pedido"""
     id: str = Field(alias="_id", description="ID del pedido")
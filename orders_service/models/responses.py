@@ -13,7 +13,7 @@ class StandardResponse(BaseModel):
 
 class HealthResponseModel(StandardResponse):
     """Respuesta del health check"""
-    data: Dict[str, str] = Field(
+    data: Dict[str, Any] = Field(
         default={"status": "healthy", "service": "Orders Service"}
     )
 
@@ -35,7 +35,11 @@ class OrderResponseModel(StandardResponse):
 class OrderListResponseModel(StandardResponse):
     """Respuesta de lista de órdenes"""
     data: List[Dict[str, Any]] = Field(default=[])
-    count: int = Field(default=0)
+    count: int = Field(default=0, description="Cantidad de pedidos en esta página")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor para pedir la siguiente página (null si no hay más)"
+    )
 
 
 class OrderCreateResponseModel(StandardResponse):
@@ -53,6 +57,49 @@ class OrderCreateResponseModel(StandardResponse):
     )
 
 
+class OrderBulkResponseModel(StandardResponse):
+    """Respuesta de creación masiva de órdenes"""
+    statusCode: int = Field(default=201)
+    data: Dict[str, Any] = Field(
+        default={
+            "created": 1,
+            "failed": 1,
+            "results": [
+                {"index": 0, "success": True, "_id": "507f1f77bcf86cd799439011"},
+                {
+                    "index": 1,
+                    "success": False,
+                    "errors": [
+                        {"field": "total_amount", "message": "Input should be greater than 0", "type": "greater_than"}
+                    ]
+                }
+            ]
+        }
+    )
+
+
+class OrderBulkStatusResponseModel(StandardResponse):
+    """Respuesta de actualización masiva de estados"""
+    data: Dict[str, Any] = Field(
+        default={
+            "updated": 1,
+            "not_found": 0,
+            "illegal_transition": 1,
+            "invalid_id": 0,
+            "duplicate": 0,
+            "results": [
+                {"order_id": "507f1f77bcf86cd799439011", "new_status": "notified", "outcome": "updated"},
+                {
+                    "order_id": "507f1f77bcf86cd799439012",
+                    "new_status": "notified",
+                    "outcome": "illegal_transition",
+                    "current_status": "notified"
+                }
+            ]
+        }
+    )
+
+
 class ErrorResponseModel(StandardResponse):
     """Respuesta de error"""
     success: bool = Field(default=False)
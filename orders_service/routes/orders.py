@@ -1,29 +1,135 @@
-from fastapi import APIRouter, status
-from typing import Dict, Any
+from fastapi import APIRouter, Body, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
+import json
+import os
 
-from models.order import OrderCreate, OrderResponse
+from models.order import (
+    OrderCreate,
+    OrderResponse,
+    OrderStatus,
+    OrderStatusUpdate,
+    allowed_previous_statuses
+)
 from models.responses import (
     OrderResponseModel,
     OrderListResponseModel,
     OrderCreateResponseModel,
+    OrderBulkResponseModel,
+    OrderBulkStatusResponseModel,
     ErrorResponseModel
 )
-from config.database import get_database
-from config.rabbit import publish_order_event
+from config.database import get_database, check_query_plan
+from config.outbox import new_outbox_entry, notify_outbox_relay
 from utils.exceptions import (
     NotFoundException,
     BadRequestException,
+    InvalidStateTransitionException,
     InternalServerException
 )
 from utils.response import success_response
+from utils.cache import order_cache
+from utils.etag import ETAG_PROJECTION, order_etag, list_etag, etag_matches
+from utils.serialization import FastJSONResponse
+from utils.pagination import KEYSET_SORT, encode_cursor, keyset_filter
+from utils.export import EXPORT_FORMATS, stream_orders, gzip_stream
+from utils.metrics import track_mongo
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 
+# El estado interno (outbox, lote de la última actualización masiva) nunca
+# se expone en las respuestas
+ORDER_PROJECTION = {"outbox": 0, "status_batch": 0}
+
+# Paginación del listado
+DEFAULT_PAGE_SIZE = int(os.getenv("ORDERS_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("ORDERS_MAX_PAGE_SIZE", "500"))
+
+# Máximo de pedidos por request en POST /bulk
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+
+# Documentos por lote del cursor en la exportación
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Campos que se pueden pedir con `fields` en el listado
+PROJECTABLE_FIELDS = {"customer_id", "products", "total_amount", "status", "created_at", "updated_at"}
+
+
+def _build_projection(fields: Optional[str]) -> Dict[str, Any]:
+    """
+    Proyección a partir de `fields`. Siempre se incluyen created_at (parte
+    del cursor) y status/updated_at (necesarios para el ETag)
+    """
+    if not fields:
+        return ORDER_PROJECTION
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - PROJECTABLE_FIELDS
+    if unknown:
+        raise BadRequestException(
+            f"Campos inválidos: {', '.join(sorted(unknown))}. "
+            f"Permitidos: {', '.join(sorted(PROJECTABLE_FIELDS))}"
+        )
+    projection = {field: 1 for field in requested}
+    projection.update(ETAG_PROJECTION)
+    return projection
+
+
+def _build_order_filter(
+    customer_id: Optional[str] = None,
+    order_status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None
+) -> Dict[str, Any]:
+    """Construir el filtro de MongoDB a partir de los parámetros opcionales"""
+    query: Dict[str, Any] = {}
+    if customer_id:
+        query["customer_id"] = customer_id
+    if order_status:
+        query["status"] = order_status
+    if created_from or created_to:
+        query["created_at"] = {}
+        if created_from:
+            query["created_at"]["$gte"] = created_from
+        if created_to:
+            query["created_at"]["$lt"] = created_to
+    if min_amount is not None or max_amount is not None:
+        query["total_amount"] = {}
+        if min_amount is not None:
+            query["total_amount"]["$gte"] = min_amount
+        if max_amount is not None:
+            query["total_amount"]["$lte"] = max_amount
+    return query
+
+
+def _now() -> datetime:
+    """datetime.now() truncado a milisegundos (la precisión que guarda MongoDB)"""
+    now = datetime.now()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def _not_modified(etag: str) -> Response:
+    """Respuesta 304 sin body"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _prepare_order_document(order: OrderCreate, now: datetime) -> Dict[str, Any]:
+    """Documento de MongoDB para un pedido nuevo (con su evento en el outbox)"""
+    order_dict = order.model_dump()
+    order_dict["status"] = OrderStatus.PENDING.value
+    order_dict["created_at"] = now
+    order_dict["outbox"] = new_outbox_entry(now)
+    return order_dict
+
 
 @router.get(
     "/",
@@ -32,36 +138,123 @@ router = APIRouter(prefix="/api/orders", tags=["orders"])
         200: {
             "description": "Lista de pedidos obtenida exitosamente",
             "model": OrderListResponseModel
+        },
+        304: {
+            "description": "La página no cambió (If-None-Match coincide con el ETag)"
         }
     }
 )
-async def get_all_orders() -> Dict[str, Any]:
+async def get_all_orders(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tamaño de página"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` de la página anterior"),
+    customer_id: Optional[str] = Query(None),
+    order_status: Optional[str] = Query(None, alias="status", description="Estado del pedido"),
+    created_from: Optional[datetime] = Query(None, description="created_at >= (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="created_at < (ISO 8601)"),
+    min_amount: Optional[float] = Query(None, ge=0, description="total_amount >="),
+    max_amount: Optional[float] = Query(None, ge=0, description="total_amount <="),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma")
+) -> Dict[str, Any]:
     """
-    Obtener todos los pedidos
+    Obtener pedidos paginados y filtrados (más recientes primero)
+
+    Paginación por cursor sobre `(created_at, _id)`: cada página cuesta lo
+    mismo sin importar cuán profunda sea. Usar `next_cursor` para pedir la
+    siguiente; es `null` en la última página. Los filtros están respaldados
+    por los índices creados al arrancar.
+
+    Devuelve un `ETag` por página; con `If-None-Match` responde 304 sin
+    serializar el body si la página no cambió.
     """
     db = get_database()
+    query = _build_order_filter(
+        customer_id, order_status, created_from, created_to, min_amount, max_amount
+    )
+    query.update(keyset_filter(cursor))
+    projection = _build_projection(fields)
     
     try:
-       
-        orders_cursor = db.orders.find({}).sort("created_at", -1)
-        orders = await orders_cursor.to_list(length=None)
-    
-        for order in orders:
-            order["_id"] = str(order["_id"])
-            if "created_at" in order:
-                order["created_at"] = order["created_at"].isoformat()
+        await check_query_plan(db.orders, query, KEYSET_SORT)
+        
+        # Se pide un elemento extra para saber si hay otra página
+        orders_cursor = db.orders.find(query, projection).sort(KEYSET_SORT).limit(limit + 1)
+        with track_mongo("list_orders"):
+            orders = await orders_cursor.to_list(length=limit + 1)
+        
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            last = orders[-1]
+            next_cursor = encode_cursor(last["created_at"], last["_id"])
+        
+        etag = list_etag(orders, next_cursor, fields)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return _not_modified(etag)
         
         logger.info(f"📋 Se encontraron {len(orders)} pedidos")
         
-        return success_response(
-            data=orders,
-            message=f"Se encontraron {len(orders)} pedidos"
+        # Los documentos se codifican tal cual (ObjectId/datetime) en un solo paso
+        return FastJSONResponse(
+            success_response(
+                data=orders,
+                message=f"Se encontraron {len(orders)} pedidos",
+                extra={"next_cursor": next_cursor}
+            ),
+            headers={"ETag": etag}
         )
     except Exception as e:
         logger.error(f"Error obteniendo pedidos: {e}")
         raise InternalServerException("Error al obtener los pedidos")
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Stream de pedidos en NDJSON o CSV",
+            "content": {media_type: {} for media_type in EXPORT_FORMATS.values()}
+        },
+        400: {
+            "description": "Formato inválido",
+            "model": ErrorResponseModel
+        }
+    }
+)
+async def export_orders(
+    export_format: str = Query("ndjson", alias="format", description="`ndjson` o `csv`"),
+    gzip: bool = Query(False, description="Comprimir la respuesta con gzip"),
+    customer_id: Optional[str] = Query(None),
+    order_status: Optional[str] = Query(None, alias="status", description="Estado del pedido"),
+    created_from: Optional[datetime] = Query(None, description="created_at >= (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="created_at < (ISO 8601)")
+) -> StreamingResponse:
+    """
+    Exportar pedidos en streaming (NDJSON o CSV)
+
+    Recorre el cursor de MongoDB por lotes y escribe las filas a medida que
+    llegan, por lo que la memoria usada no depende del tamaño de la colección.
+    """
+    db = get_database()
+
+    if export_format not in EXPORT_FORMATS:
+        raise BadRequestException(f"Formato inválido: {export_format} (usar ndjson o csv)")
+
+    query = _build_order_filter(customer_id, order_status, created_from, created_to)
+    cursor = db.orders.find(query, ORDER_PROJECTION).batch_size(EXPORT_BATCH_SIZE)
+
+    body = stream_orders(cursor, export_format, EXPORT_BATCH_SIZE)
+    headers = {"Content-Disposition": f'attachment; filename="orders.{export_format}"'}
+    if gzip:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    logger.info(f"📦 Exportando pedidos ({export_format}{', gzip' if gzip else ''}) - filtro: {query}")
+
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[export_format], headers=headers)
+
+
 @router.get(
     "/{order_id}",
     response_model=OrderResponseModel,
@@ -70,6 +263,9 @@ async def get_all_orders() -> Dict[str, Any]:
             "description": "Pedido obtenido exitosamente",
             "model": OrderResponseModel
         },
+        304: {
+            "description": "El pedido no cambió (If-None-Match coincide con el ETag)"
+        },
         400: {
             "description": "ID de pedido inválido",
             "model": ErrorResponseModel
@@ -80,9 +276,13 @@ async def get_all_orders() -> Dict[str, Any]:
         }
     }
 )
-async def get_order(order_id: str) -> Dict[str, Any]:
+async def get_order(order_id: str, request: Request) -> Dict[str, Any]:
     """
     Obtener un pedido por ID
+
+    Devuelve un `ETag` fuerte; con `If-None-Match` responde 304 sin body si
+    el pedido no cambió (resuelto desde el cache o con una consulta que solo
+    trae los campos de versión).
     """
     db = get_database()
     
@@ -90,24 +290,47 @@ async def get_order(order_id: str) -> Dict[str, Any]:
         logger.warning(f"ID de pedido inválido: {order_id}")
         raise BadRequestException("ID de pedido inválido")
     
+    cache_key = str(ObjectId(order_id))
+    if_none_match = request.headers.get("if-none-match")
+    
     try:
-
-        order = await db.orders.find_one({"_id": ObjectId(order_id)})
+        # Read-through: cache primero, MongoDB solo en un miss
+        order = await order_cache.get(cache_key)
+        
+        if order is None and if_none_match:
+            # Petición condicional: basta con los campos de versión
+            with track_mongo("get_order_version"):
+                version = await db.orders.find_one({"_id": ObjectId(order_id)}, ETAG_PROJECTION)
+            if not version:
+                logger.warning(f"Pedido no encontrado: {order_id}")
+                raise NotFoundException("Pedido", order_id)
+            if etag_matches(if_none_match, order_etag(version)):
+                return _not_modified(order_etag(version))
+        
+        if order is None:
+            async def load_order():
+                with track_mongo("get_order"):
+                    return await db.orders.find_one({"_id": ObjectId(order_id)}, ORDER_PROJECTION)
+            
+            # No se guarda si una escritura del pedido ocurrió durante la lectura
+            order = await order_cache.load(cache_key, load_order)
         
         if not order:
             logger.warning(f"Pedido no encontrado: {order_id}")
             raise NotFoundException("Pedido", order_id)
         
-        # Convertir ObjectId a string y datetime a ISO format
-        order["_id"] = str(order["_id"])
-        if "created_at" in order:
-            order["created_at"] = order["created_at"].isoformat()
+        etag = order_etag(order)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
         
         logger.info(f"Pedido obtenido: {order_id}")
         
-        return success_response(
-            data=order,
-            message="Pedido obtenido exitosamente"
+        return FastJSONResponse(
+            success_response(
+                data=order,
+                message="Pedido obtenido exitosamente"
+            ),
+            headers={"ETag": etag}
         )
     except (NotFoundException, BadRequestException):
         raise
@@ -138,44 +361,36 @@ async def get_order(order_id: str) -> Dict[str, Any]:
 async def create_order(order: OrderCreate) -> Dict[str, Any]:
     """
     Crear un nuevo pedido
-    **Mensajería**: Publica evento a RabbitMQ para notificaciones
+    **Mensajería**: El evento se guarda en el outbox junto con el pedido y un
+    relay en segundo plano lo publica a RabbitMQ (entrega at-least-once)
     """
     db = get_database()
     
     try:
         # Preparar documento para MongoDB
-        order_dict = order.model_dump()
-        order_dict["status"] = "pending"
-        order_dict["created_at"] = datetime.now()
+        order_dict = _prepare_order_document(order, _now())
         
-        # Insertar en MongoDB
-        result = await db.orders.insert_one(order_dict)
+        # Insertar pedido + evento pendiente en una sola escritura atómica
+        with track_mongo("create_order"):
+            result = await db.orders.insert_one(order_dict)
         order_id = str(result.inserted_id)
         
         logger.info(f"Pedido creado en MongoDB: {order_id}")
         
-        # Publicar evento a RabbitMQ
-        event_data = {
-            "order_id": order_id,
-            "customer_id": order.customer_id,
-            "total_amount": order.total_amount,
-            "products": order.products,
-            "timestamp": order_dict["created_at"].isoformat()
-        }
-        
-        publish_success = publish_order_event(event_data)
-        
-        if not publish_success:
-            logger.warning(f"Pedido creado pero no se pudo publicar evento: {order_id}")
+        # El relay publica el evento fuera del request
+        notify_outbox_relay()
         
         # Preparar respuesta
-        order_dict["_id"] = order_id
-        order_dict["created_at"] = order_dict["created_at"].isoformat()
+        order_dict.pop("outbox", None)
+        await order_cache.set(order_id, order_dict)
         
-        return success_response(
-            data=order_dict,
-            message="Pedido creado exitosamente",
-            status_code=201
+        return FastJSONResponse(
+            success_response(
+                data=order_dict,
+                message="Pedido creado exitosamente",
+                status_code=201
+            ),
+            status_code=status.HTTP_201_CREATED
         )
         
     except Exception as e:
@@ -183,6 +398,154 @@ async def create_order(order: OrderCreate) -> Dict[str, Any]:
         raise InternalServerException(f"Error al crear el pedido: {str(e)}")
 
 
+def _parse_bulk_body(raw: bytes, content_type: str) -> List[Any]:
+    """Leer el body como array JSON o como NDJSON (un pedido por línea)"""
+    try:
+        if "ndjson" in content_type:
+            return [
+                json.loads(line)
+                for line in raw.decode("utf-8").splitlines()
+                if line.strip()
+            ]
+        items = json.loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise BadRequestException(f"Body inválido: {e}")
+
+    if not isinstance(items, list):
+        raise BadRequestException("El body debe ser un array de pedidos")
+    return items
+
+
+def _validate_bulk_items(items: List[Any]) -> Tuple[List[Tuple[int, OrderCreate]], Dict[int, List[Dict[str, str]]]]:
+    """Validar todos los pedidos en una pasada, separando válidos de inválidos"""
+    valid = []
+    invalid = {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, OrderCreate.model_validate(item)))
+        except ValidationError as e:
+            invalid[index] = [
+                {
+                    "field": ".".join(str(x) for x in error["loc"]),
+                    "message": error["msg"],
+                    "type": error["type"]
+                }
+                for error in e.errors()
+            ]
+    return valid, invalid
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=OrderBulkResponseModel,
+    responses={
+        201: {
+            "description": "Todos los pedidos fueron creados",
+            "model": OrderBulkResponseModel
+        },
+        207: {
+            "description": "Creación parcial: revisar `results` por pedido",
+            "model": OrderBulkResponseModel
+        },
+        400: {
+            "description": "Body inválido o demasiados pedidos",
+            "model": ErrorResponseModel
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/OrderCreate"}
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "description": "Un OrderCreate JSON por línea"}
+                }
+            }
+        }
+    }
+)
+async def create_orders_bulk(request: Request) -> Dict[str, Any]:
+    """
+    Crear pedidos en lote (array JSON o NDJSON)
+
+    Valida todos los pedidos en una pasada, los inserta con un único
+    `insert_many` no ordenado y deja sus eventos en el outbox para que el
+    relay los publique en lote. Devuelve el resultado de cada pedido.
+    """
+    db = get_database()
+
+    items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if not items:
+        raise BadRequestException("No se recibieron pedidos")
+    if len(items) > BULK_MAX_ITEMS:
+        raise BadRequestException(f"Máximo {BULK_MAX_ITEMS} pedidos por request")
+
+    valid, invalid = _validate_bulk_items(items)
+
+    results: Dict[int, Dict[str, Any]] = {
+        index: {"index": index, "success": False, "errors": errors}
+        for index, errors in invalid.items()
+    }
+
+    if valid:
+        now = _now()
+        documents = [_prepare_order_document(order, now) for _, order in valid]
+
+        failed_writes: Dict[int, str] = {}
+        try:
+            # insert_many asigna el _id a cada documento antes de enviarlo
+            with track_mongo("create_orders_bulk"):
+                await db.orders.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                failed_writes[write_error["index"]] = write_error.get("errmsg", "Error de escritura")
+        except Exception as e:
+            logger.error(f"Error insertando pedidos en lote: {e}")
+            raise InternalServerException("Error al crear los pedidos")
+
+        for position, (index, _) in enumerate(valid):
+            if position in failed_writes:
+                results[index] = {
+                    "index": index,
+                    "success": False,
+                    "errors": [{"field": "", "message": failed_writes[position], "type": "write_error"}]
+                }
+            else:
+                results[index] = {
+                    "index": index,
+                    "success": True,
+                    "_id": str(documents[position]["_id"])
+                }
+
+        # El relay publica todos los eventos del lote
+        notify_outbox_relay()
+
+    created = sum(1 for result in results.values() if result["success"])
+    failed = len(items) - created
+    logger.info(f"📦 Carga masiva: {created} pedidos creados, {failed} con errores")
+
+    status_code = status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED
+
+    return FastJSONResponse(
+        success_response(
+            data={
+                "created": created,
+                "failed": failed,
+                "results": [results[index] for index in range(len(items))]
+            },
+            message=f"{created} pedidos creados, {failed} con errores",
+            status_code=status_code
+        ),
+        status_code=status_code
+    )
+
+
 @router.patch(
     "/{order_id}/status",
     response_model=OrderResponseModel,
@@ -198,10 +561,14 @@ async def create_order(order: OrderCreate) -> Dict[str, Any]:
         404: {
             "description": "Pedido no encontrado",
             "model": ErrorResponseModel
+        },
+        409: {
+            "description": "Transición de estado inválida o repetida",
+            "model": ErrorResponseModel
         }
     }
 )
-async def update_order_status(order_id: str, new_status: str = "notified") -> Dict[str, Any]:
+async def update_order_status(order_id: str, new_status: OrderStatus = OrderStatus.NOTIFIED) -> Dict[str, Any]:
     """
     🔔 Actualizar estado del pedido (usado por notifications service)
     
@@ -211,6 +578,11 @@ async def update_order_status(order_id: str, new_status: str = "notified") -> Di
     - `processing`: En procesamiento
     - `completed`: Completado
     - `cancelled`: Cancelado
+    
+    **Transiciones válidas:** pending → notified → processing → completed,
+    y cancelled desde cualquier estado no final. La transición se valida y
+    aplica en una única operación atómica; las inválidas o repetidas
+    devuelven 409.
     """
     db = get_database()
     
@@ -219,45 +591,151 @@ async def update_order_status(order_id: str, new_status: str = "notified") -> Di
         raise BadRequestException("ID de pedido inválido")
     
     try:
-        # Verificar que el pedido existe
-        existing_order = await db.orders.find_one({"_id": ObjectId(order_id)})
+        # Actualizar solo si el estado actual permite la transición
+        with track_mongo("update_order_status"):
+            updated_order = await db.orders.find_one_and_update(
+                {
+                    "_id": ObjectId(order_id),
+                    "status": {"$in": allowed_previous_statuses(new_status)}
+                },
+                {"$set": {"status": new_status.value, "updated_at": _now()}},
+                projection=ORDER_PROJECTION,
+                return_document=ReturnDocument.AFTER
+            )
         
-        if not existing_order:
-            logger.warning(f"Pedido no encontrado para actualizar: {order_id}")
-            raise NotFoundException("Pedido", order_id)
+        if updated_order is None:
+            # Solo en el camino de error: distinguir inexistente de transición inválida
+            with track_mongo("get_order_status"):
+                current = await db.orders.find_one({"_id": ObjectId(order_id)}, {"status": 1})
+            if not current:
+                logger.warning(f"Pedido no encontrado para actualizar: {order_id}")
+                raise NotFoundException("Pedido", order_id)
+            logger.warning(
+                f"Transición inválida para pedido {order_id}: "
+                f"'{current.get('status')}' → '{new_status.value}'"
+            )
+            raise InvalidStateTransitionException(
+                "Pedido", order_id, current.get("status"), new_status.value
+            )
         
-        # Actualizar el estado
-        update_data = {
-            "status": new_status,
-            "updated_at": datetime.now()
-        }
+        await order_cache.set(str(updated_order["_id"]), updated_order)
         
-        result = await db.orders.update_one(
-            {"_id": ObjectId(order_id)},
-            {"$set": update_data}
-        )
+        logger.info(f"🔔 Estado del pedido {order_id} actualizado a '{new_status.value}'")
         
-        if result.modified_count == 0:
-            logger.warning(f"No se pudo actualizar el pedido: {order_id}")
-            raise InternalServerException("No se pudo actualizar el estado del pedido")
-        
-        # Obtener el pedido actualizado
-        updated_order = await db.orders.find_one({"_id": ObjectId(order_id)})
-        updated_order["_id"] = str(updated_order["_id"])
-        if "created_at" in updated_order:
-            updated_order["created_at"] = updated_order["created_at"].isoformat()
-        if "updated_at" in updated_order:
-            updated_order["updated_at"] = updated_order["updated_at"].isoformat()
-        
-        logger.info(f"🔔 Estado del pedido {order_id} actualizado a '{new_status}'")
-        
-        return success_response(
-            data=updated_order,
-            message=f"Estado actualizado a '{new_status}' exitosamente"
+        return FastJSONResponse(
+            success_response(
+                data=updated_order,
+                message=f"Estado actualizado a '{new_status.value}' exitosamente"
+            )
         )
         
-    except (NotFoundException, BadRequestException):
+    except (NotFoundException, BadRequestException, InvalidStateTransitionException):
         raise
     except Exception as e:
         logger.error(f"Error actualizando estado del pedido {order_id}: {e}")
         raise InternalServerException("Error al actualizar el estado del pedido")
+
+
+@router.patch(
+    "/status",
+    response_model=OrderBulkStatusResponseModel,
+    responses={
+        200: {
+            "description": "Todos los estados fueron actualizados",
+            "model": OrderBulkStatusResponseModel
+        },
+        207: {
+            "description": "Actualización parcial: revisar `results` por pedido",
+            "model": OrderBulkStatusResponseModel
+        }
+    }
+)
+async def update_orders_status_bulk(
+    updates: List[OrderStatusUpdate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS)
+) -> Dict[str, Any]:
+    """
+    🔔 Actualizar estados en lote (confirmaciones agrupadas del notifications service)
+
+    Aplica todos los cambios con un único `bulk_write` no ordenado de
+    actualizaciones condicionales (misma máquina de estados que el endpoint
+    individual) y una sola lectura para clasificar cada pedido como
+    `updated`, `not_found`, `illegal_transition`, `invalid_id` o `duplicate`.
+    """
+    db = get_database()
+
+    now = _now()
+    # Token único del lote: al releer identifica las escrituras de esta
+    # llamada aunque otra escritura del mismo pedido caiga en el mismo ms
+    batch_token = ObjectId()
+
+    results: List[Dict[str, Any]] = []
+    operations = []
+    applied: Dict[ObjectId, Dict[str, Any]] = {}
+
+    for update in updates:
+        result = {"order_id": update.order_id, "new_status": update.new_status.value}
+        results.append(result)
+
+        if not ObjectId.is_valid(update.order_id):
+            result["outcome"] = "invalid_id"
+            continue
+        object_id = ObjectId(update.order_id)
+        if object_id in applied:
+            result["outcome"] = "duplicate"
+            continue
+
+        applied[object_id] = result
+        operations.append(UpdateOne(
+            {"_id": object_id, "status": {"$in": allowed_previous_statuses(update.new_status)}},
+            {"$set": {"status": update.new_status.value, "updated_at": now, "status_batch": batch_token}}
+        ))
+
+    try:
+        if operations:
+            with track_mongo("update_orders_status_bulk"):
+                await db.orders.bulk_write(operations, ordered=False)
+
+            with track_mongo("get_orders_status_bulk"):
+                current = {
+                    order["_id"]: order
+                    async for order in db.orders.find(
+                        {"_id": {"$in": list(applied)}},
+                        {"status": 1, "status_batch": 1}
+                    )
+                }
+            for object_id, result in applied.items():
+                order = current.get(object_id)
+                if order is None:
+                    result["outcome"] = "not_found"
+                elif order.get("status_batch") == batch_token:
+                    result["outcome"] = "updated"
+                else:
+                    result["outcome"] = "illegal_transition"
+                    result["current_status"] = order.get("status")
+
+            await order_cache.invalidate(*(
+                str(object_id) for object_id, result in applied.items()
+                if result["outcome"] == "updated"
+            ))
+    except Exception as e:
+        logger.error(f"Error en actualización masiva de estados: {e}")
+        raise InternalServerException("Error al actualizar los estados de los pedidos")
+
+    summary = {
+        outcome: sum(1 for result in results if result["outcome"] == outcome)
+        for outcome in ("updated", "not_found", "illegal_transition", "invalid_id", "duplicate")
+    }
+    logger.info(f"🔔 Actualización masiva de estados: {summary}")
+
+    status_code = (
+        status.HTTP_207_MULTI_STATUS if summary["updated"] < len(results) else status.HTTP_200_OK
+    )
+
+    return FastJSONResponse(
+        success_response(
+            data={**summary, "results": results},
+            message=f"{summary['updated']} de {len(results)} estados actualizados",
+            status_code=status_code
+        ),
+        status_code=status_code
+    )
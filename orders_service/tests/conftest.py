@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del servicio se importan como en producción (desde orders_service/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,116 @@
+import asyncio
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+from config import outbox
+
+# Sustituto de pymongo.UpdateOne que deja el filtro y el update legibles
+RecordedUpdate = namedtuple("RecordedUpdate", "filter update")
+
+
+@pytest.fixture(autouse=True)
+def record_updates(monkeypatch):
+    monkeypatch.setattr(outbox, "UpdateOne", RecordedUpdate)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, *args):
+        return self
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class FakeOrders:
+    def __init__(self, docs):
+        self.docs = docs
+        self.operations = []
+
+    def find(self, *args, **kwargs):
+        return FakeCursor(self.docs)
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.extend(operations)
+
+
+class FakeDatabase:
+    def __init__(self, docs):
+        self.orders = FakeOrders(docs)
+
+
+def _pending_orders(count):
+    now = datetime.now()
+    return [
+        {
+            "_id": f"order-{i}",
+            "customer_id": "c",
+            "total_amount": 1.0,
+            "products": ["p"],
+            "created_at": now,
+            "outbox": outbox.new_outbox_entry(now)
+        }
+        for i in range(count)
+    ]
+
+
+def test_relay_stops_batch_after_first_broker_failure(monkeypatch):
+    db = FakeDatabase(_pending_orders(20))
+    # Como el executor de publicación: 4 publicaciones a la vez, el resto en cola
+    slots = asyncio.Semaphore(4)
+    attempted = []
+
+    async def failing_publish(event):
+        async with slots:
+            attempted.append(event["order_id"])
+            await asyncio.sleep(0.05)  # reintentos contra un broker caído
+            return False
+
+    monkeypatch.setattr(outbox, "get_database", lambda: db)
+    monkeypatch.setattr(outbox, "publish_order_event_async", failing_publish)
+
+    sent = asyncio.run(outbox.relay_pending_events())
+
+    assert sent == 0
+    # La primera tanda, más los que tomaron un slot en la misma vuelta del loop
+    # en que se detectó el fallo; sin el corte serían las 20
+    assert len(attempted) <= 8
+    # Todos quedan reprogramados con backoff y ninguno marcado como enviado
+    assert len(db.orders.operations) == 20
+    for operation in db.orders.operations:
+        update = operation.update["$set"]
+        assert update["outbox.attempts"] == 1
+        assert "outbox.status" not in update
+
+
+def test_relay_skips_unstarted_publishes_after_failure(monkeypatch):
+    db = FakeDatabase(_pending_orders(10))
+    slots = asyncio.Semaphore(4)
+    started = []
+
+    async def publish(event):
+        async with slots:
+            started.append(event["order_id"])
+            if event["order_id"] == "order-0":
+                return False
+            await asyncio.sleep(1)  # el resto no termina antes de la cancelación
+            return True
+
+    monkeypatch.setattr(outbox, "get_database", lambda: db)
+    monkeypatch.setattr(outbox, "publish_order_event_async", publish)
+
+    sent = asyncio.run(asyncio.wait_for(outbox.relay_pending_events(), timeout=0.5))
+
+    assert sent == 0
+    # Los que seguían esperando un slot no llegan a publicar
+    assert len(started) < 10
+    assert len(db.orders.operations) == 10
+    for operation in db.orders.operations:
+        assert "outbox.status" not in operation.update["$set"]
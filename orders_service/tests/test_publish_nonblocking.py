@@ -0,0 +1,94 @@
+import time
+import asyncio
+
+import httpx
+
+import main
+from config import rabbit
+
+PUBLISH_DELAY = 0.5
+CONCURRENT_PUBLISHES = 8
+# Margen amplio para CI lento; un publish bloqueante en el loop daría >= PUBLISH_DELAY
+MAX_LOOP_LAG = 0.1
+
+
+def slow_publish(order_data):
+    """Publicación bloqueante lenta (broker congestionado)"""
+    time.sleep(PUBLISH_DELAY)
+    return True
+
+
+async def _ticker(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Mayor retraso observado del event loop respecto de `interval`"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+def test_slow_publishes_do_not_block_event_loop(monkeypatch):
+    monkeypatch.setattr(rabbit, "publish_order_event", slow_publish)
+    monkeypatch.setattr(rabbit, "_batch_publisher", None)
+
+    async def scenario():
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_ticker(stop))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            rabbit.publish_order_event_async({"order_id": str(i)})
+            for i in range(CONCURRENT_PUBLISHES)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        return results, elapsed, await ticker
+
+    try:
+        results, elapsed, worst_lag = asyncio.run(scenario())
+    finally:
+        rabbit.close_rabbitmq_connection()
+
+    assert results == [True] * CONCURRENT_PUBLISHES
+    # Las publicaciones corrieron de verdad (y en paralelo en el executor)
+    assert elapsed >= PUBLISH_DELAY
+    assert worst_lag < MAX_LOOP_LAG
+
+
+def test_get_latency_stays_flat_while_publishing(monkeypatch):
+    monkeypatch.setattr(rabbit, "publish_order_event", slow_publish)
+    monkeypatch.setattr(rabbit, "_batch_publisher", None)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Referencia sin publicaciones en curso
+            started = time.perf_counter()
+            assert (await client.get("/")).status_code == 200
+            baseline = time.perf_counter() - started
+
+            publishes = [
+                asyncio.create_task(rabbit.publish_order_event_async({"order_id": str(i)}))
+                for i in range(CONCURRENT_PUBLISHES)
+            ]
+            await asyncio.sleep(0.05)  # las publicaciones ya están bloqueadas en el executor
+
+            latencies = []
+            for _ in range(5):
+                started = time.perf_counter()
+                response = await client.get("/")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            pending = sum(1 for task in publishes if not task.done())
+
+            await asyncio.gather(*publishes)
+            return baseline, latencies, pending
+
+    try:
+        baseline, latencies, pending = asyncio.run(scenario())
+    finally:
+        rabbit.close_rabbitmq_connection()
+
+    # Los GET se midieron mientras las publicaciones seguían en curso
+    assert pending > 0
+    assert max(latencies) < baseline + MAX_LOOP_LAG
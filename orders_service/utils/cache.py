@@ -0,0 +1,225 @@
+import os
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+ORDER_CACHE_ENABLED = os.getenv("ORDER_CACHE_ENABLED", "true").lower() == "true"
+ORDER_CACHE_MAX_SIZE = int(os.getenv("ORDER_CACHE_MAX_SIZE", "10000"))
+ORDER_CACHE_TTL = float(os.getenv("ORDER_CACHE_TTL", "30"))
+# "local" (en proceso, por worker) o "redis" (compartido entre workers)
+ORDER_CACHE_BACKEND = os.getenv("ORDER_CACHE_BACKEND", "local")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class CacheBackend(ABC):
+    """Interfaz de almacenamiento del cache (local o compartido)"""
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Valor guardado, o None si no existe o expiró"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any], ttl: float):
+        """Guardar un valor con expiración `ttl` (segundos)"""
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[str]):
+        """Eliminar claves (las inexistentes se ignoran)"""
+
+    def size(self) -> Optional[int]:
+        return None
+
+    async def close(self):
+        pass
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Cache en proceso acotado por tamaño, con desalojo LRU y expiración TTL.
+
+    También sirve como sustituto del backend compartido en pruebas.
+    """
+
+    name = "local"
+
+    def __init__(self, max_size: int = ORDER_CACHE_MAX_SIZE):
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: Iterable[str]):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend compartido en Redis: todos los workers ven las mismas entradas"""
+
+    name = "redis"
+    PREFIX = "orders:cache:"
+
+    def __init__(self, url: str = REDIS_URL):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("ORDER_CACHE_BACKEND=redis requiere el paquete 'redis'")
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(self.PREFIX + key)
+        return loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: float):
+        # ObjectId/datetime se guardan como string (mismo formato que la API)
+        await self._client.set(self.PREFIX + key, dumps(value), px=int(ttl * 1000))
+
+    async def delete(self, keys: Iterable[str]):
+        keys = [self.PREFIX + key for key in keys]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class OrderCache:
+    """
+    Cache read-through de pedidos individuales con contadores de hit/miss.
+
+    Las escrituras (`set`, `invalidate`) suben la generación de las claves
+    que se están cargando desde MongoDB; `load` solo guarda lo leído si la
+    generación no cambió, así una lectura lenta nunca pisa un estado más
+    nuevo. La generación es por proceso: con Redis, entre workers distintos
+    la ventana sigue acotada por el TTL.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = ORDER_CACHE_TTL, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stale_loads = 0
+        # clave -> [cargas en curso, generación]; solo existe mientras hay cargas
+        self._loading: Dict[str, List[int]] = {}
+
+    async def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Pedido desde el cache (o None)"""
+        if not self.enabled:
+            return None
+        try:
+            value = await self.backend.get(order_id)
+        except Exception as e:
+            logger.warning(f"Error leyendo cache de pedidos: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(value)
+
+    async def load(
+        self,
+        order_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cargar un pedido tras un miss y guardarlo, salvo que una escritura
+        del mismo pedido haya ocurrido durante la carga.
+        """
+        entry = self._loading.setdefault(order_id, [0, 0])
+        entry[0] += 1
+        generation = entry[1]
+        try:
+            value = await loader()
+        finally:
+            entry[0] -= 1
+            if entry[0] == 0:
+                del self._loading[order_id]
+        if value is not None:
+            if entry[1] == generation:
+                await self._store(order_id, value)
+            else:
+                self.stale_loads += 1
+        return value
+
+    def _bump(self, order_ids: Iterable[str]):
+        for order_id in order_ids:
+            entry = self._loading.get(order_id)
+            if entry is not None:
+                entry[1] += 1
+
+    async def set(self, order_id: str, value: Dict[str, Any]):
+        """Guardar/refrescar un pedido tras una escritura"""
+        self._bump((order_id,))
+        await self._store(order_id, value)
+
+    async def _store(self, order_id: str, value: Dict[str, Any]):
+        if not self.enabled:
+            return
+        try:
+            await self.backend.set(order_id, dict(value), self.ttl)
+        except Exception as e:
+            logger.warning(f"Error escribiendo cache de pedidos: {e}")
+
+    async def invalidate(self, *order_ids: str):
+        """Eliminar pedidos del cache tras una escritura"""
+        self._bump(order_ids)
+        if not self.enabled or not order_ids:
+            return
+        try:
+            await self.backend.delete(order_ids)
+        except Exception as e:
+            logger.warning(f"Error invalidando cache de pedidos: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso del cache"""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "size": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_loads": self.stale_loads,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+    async def close(self):
+        await self.backend.close()
+
+
+def _build_backend() -> CacheBackend:
+    if ORDER_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL)
+    return LocalCacheBackend(ORDER_CACHE_MAX_SIZE)
+
+
+order_cache = OrderCache(_build_backend(), ORDER_CACHE_TTL, ORDER_CACHE_ENABLED)
@@ -0,0 +1,50 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+# Campos mínimos para calcular el ETag de un pedido sin traer el documento
+ETAG_PROJECTION = {"status": 1, "updated_at": 1, "created_at": 1}
+
+
+def _version_part(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return "" if value is None else str(value)
+
+
+def order_etag(order: Dict[str, Any]) -> str:
+    """
+    ETag fuerte de un pedido: _id + updated_at (o created_at) + status.
+
+    Acepta tanto el documento de MongoDB como el ya serializado.
+    """
+    version = order.get("updated_at") or order.get("created_at")
+    key = f"{_version_part(order.get('_id'))}|{_version_part(version)}|{_version_part(order.get('status'))}"
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+
+def list_etag(
+    orders: Iterable[Dict[str, Any]],
+    next_cursor: Optional[str],
+    variant: Optional[str] = None
+) -> str:
+    """
+    ETag fuerte de una página: combina los ETags de sus pedidos, el cursor
+    siguiente y la variante de representación (ej. la proyección pedida)
+    """
+    digest = hashlib.sha1()
+    for order in orders:
+        digest.update(order_etag(order).encode("ascii"))
+    digest.update(_version_part(next_cursor).encode("utf-8"))
+    digest.update(_version_part(variant).encode("utf-8"))
+    return '"' + digest.hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparar If-None-Match con el ETag actual (comparación débil, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
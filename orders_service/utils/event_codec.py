@@ -0,0 +1,40 @@
+import gzip
+import json
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack es opcional
+    msgpack = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+GZIP_ENCODING = "gzip"
+
+EVENT_ENCODINGS = ("json", "msgpack")
+
+
+def encode_event(
+    event: Dict[str, Any],
+    encoding: str = "json",
+    compression_threshold: int = 0
+) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Serializar un evento para RabbitMQ.
+
+    Devuelve (body, content_type, content_encoding). Con `compression_threshold`
+    > 0 los cuerpos que lo superan se comprimen con gzip; el consumer elige el
+    decodificador a partir de content_type/content_encoding.
+    """
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("RABBITMQ_EVENT_ENCODING=msgpack requiere el paquete 'msgpack'")
+        body = msgpack.packb(event, use_bin_type=True)
+        content_type = MSGPACK_CONTENT_TYPE
+    else:
+        body = json.dumps(event).encode("utf-8")
+        content_type = JSON_CONTENT_TYPE
+
+    if compression_threshold and len(body) > compression_threshold:
+        return gzip.compress(body, compresslevel=6), content_type, GZIP_ENCODING
+    return body, content_type, None
@@ -48,6 +48,17 @@ class AlreadyExistsException(CustomHTTPException):
         )
 
 
+class InvalidStateTransitionException(CustomHTTPException):
+    """Excepción para transiciones de estado no permitidas (409)"""
+    def __init__(self, resource: str, identifier: str, current_status: str, new_status: str):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            message=f"Transición de estado inválida: '{current_status}' → '{new_status}'",
+            resource=resource,
+            identifier=identifier
+        )
+
+
 class BadRequestException(CustomHTTPException):
     """Excepción para peticiones inválidas (400)"""
     def __init__(self, message: str, resource: str = None, identifier: str = None):
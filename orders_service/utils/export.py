@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+
+from bson import ObjectId
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+CSV_COLUMNS = ["_id", "customer_id", "status", "total_amount", "products", "created_at", "updated_at"]
+
+
+def _plain_value(value: Any) -> Any:
+    """ObjectId/datetime a string para poder serializar la fila"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (ObjectId, datetime)):
+        return _plain_value(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _ndjson_chunk(orders: List[Dict[str, Any]]) -> str:
+    return "".join(
+        json.dumps(order, default=_json_default, ensure_ascii=False) + "\n"
+        for order in orders
+    )
+
+
+def _csv_chunk(orders: List[Dict[str, Any]], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for order in orders:
+        writer.writerow([
+            "|".join(order.get("products", [])) if column == "products"
+            else _plain_value(order.get(column, ""))
+            for column in CSV_COLUMNS
+        ])
+    return buffer.getvalue()
+
+
+async def stream_orders(cursor, fmt: str, batch_size: int) -> AsyncIterator[bytes]:
+    """
+    Convertir un cursor de Motor en chunks NDJSON/CSV.
+
+    Solo se mantiene en memoria un lote de `batch_size` documentos.
+    """
+    batch: List[Dict[str, Any]] = []
+    header = fmt == "csv"
+
+    async for order in cursor:
+        batch.append(order)
+        if len(batch) >= batch_size:
+            yield (_csv_chunk(batch, header) if fmt == "csv" else _ndjson_chunk(batch)).encode("utf-8")
+            header = False
+            batch = []
+
+    if batch or header:
+        yield (_csv_chunk(batch, header) if fmt == "csv" else _ndjson_chunk(batch)).encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Comprimir un stream de bytes con gzip sobre la marcha"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,99 @@
+import time
+from contextlib import contextmanager
+
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Métricas en memoria del proceso: registrar una observación es un incremento
+# bajo lock, el coste real se paga solo al servir GET /metrics
+
+HTTP_REQUESTS = Counter(
+    "orders_http_requests_total",
+    "Requests HTTP atendidos",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "orders_http_request_duration_seconds",
+    "Latencia de requests HTTP por ruta",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "orders_http_requests_in_flight",
+    "Requests HTTP en curso"
+)
+
+MONGO_OPERATION_DURATION = Histogram(
+    "orders_mongo_operation_duration_seconds",
+    "Latencia de operaciones de MongoDB",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+MONGO_OPERATION_ERRORS = Counter(
+    "orders_mongo_operation_errors_total",
+    "Operaciones de MongoDB fallidas",
+    ["operation"]
+)
+
+RABBITMQ_PUBLISH_DURATION = Histogram(
+    "orders_rabbitmq_publish_duration_seconds",
+    "Latencia de publicación confirmada (incluye reintentos)",
+    ["mode"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10)
+)
+RABBITMQ_PUBLISH_TOTAL = Counter(
+    "orders_rabbitmq_publish_total",
+    "Eventos publicados por resultado",
+    ["mode", "result"]
+)
+RABBITMQ_PUBLISH_RETRIES = Counter(
+    "orders_rabbitmq_publish_retries_total",
+    "Intentos de publicación fallidos por motivo",
+    ["reason"]
+)
+
+DEPENDENCY_UP = Gauge(
+    "orders_dependency_up",
+    "Resultado del último probe de cada dependencia (1 = disponible)",
+    ["dependency"]
+)
+DEPENDENCY_LATENCY = Gauge(
+    "orders_dependency_latency_seconds",
+    "Latencia del último probe de cada dependencia",
+    ["dependency"]
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "orders_log_records_dropped_total",
+    "Registros de log descartados con la cola de logging llena (LOG_ASYNC=true)"
+)
+
+
+@contextmanager
+def track_mongo(operation: str):
+    """Medir una operación de MongoDB (`with track_mongo("find_one"): await ...`)"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        MONGO_OPERATION_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        MONGO_OPERATION_DURATION.labels(operation).observe(time.perf_counter() - start)
+
+
+def observe_publish(mode: str, start: float, result: str):
+    """Registrar una publicación terminada (`start` de time.perf_counter())"""
+    RABBITMQ_PUBLISH_DURATION.labels(mode).observe(time.perf_counter() - start)
+    RABBITMQ_PUBLISH_TOTAL.labels(mode, result).inc()
+
+
+def route_label(request: Request) -> str:
+    """Plantilla de la ruta (/api/orders/{order_id}) para acotar la cardinalidad"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def render_metrics() -> tuple:
+    """Cuerpo y content type de la exposición en formato Prometheus"""
+    return generate_latest(), CONTENT_TYPE_LATEST
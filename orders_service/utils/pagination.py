@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from bson import ObjectId
+
+from utils.exceptions import BadRequestException
+
+# Orden estable del listado: más recientes primero, _id como desempate
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def encode_cursor(created_at: datetime, order_id: ObjectId) -> str:
+    """Cursor opaco a partir de la clave (created_at, _id) del último elemento"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(order_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decodificar un cursor generado por encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), ObjectId(payload["i"])
+    except Exception:
+        raise BadRequestException("Cursor de paginación inválido")
+
+
+def keyset_filter(cursor: Optional[str]) -> Dict[str, Any]:
+    """Filtro para continuar después del cursor (vacío en la primera página)"""
+    if not cursor:
+        return {}
+    created_at, order_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": order_id}}
+        ]
+    }
@@ -25,10 +25,13 @@ class StandardResponse(BaseModel):
 def success_response(
     data: Optional[Union[Dict, List[Dict], Any]] = None,
     message: str = "Operación exitosa",
-    status_code: int = 200
+    status_code: int = 200,
+    extra: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Crear respuesta exitosa estandarizada
+
+    `extra` agrega campos de primer nivel (ej. `next_cursor` en listados)
     """
     response = {
         "success": True,
@@ -42,6 +45,9 @@ def success_response(
             response["count"] = len(data)
         response["data"] = data
     
+    if extra:
+        response.update(extra)
+    
     return response
 
 
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Tipos de MongoDB que el encoder no conoce: ObjectId y datetime"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        # isoformat() mantiene el formato histórico de la API
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializar a JSON codificando ObjectId/datetime sin pasos intermedios"""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: Any) -> Any:
+    """Deserializar JSON (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON de camino rápido para documentos de MongoDB.
+
+    Los handlers la devuelven directamente: FastAPI no vuelve a validar el
+    contenido contra `response_model` (que sigue documentando el esquema en
+    OpenAPI) y el body se codifica una sola vez con orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)